@@ -2,10 +2,14 @@
 Streamlit UI for Intelligent Appointment Optimizer
 """
 
+import textwrap
+import time
 import streamlit as st
 from datetime import datetime
+from typing import Dict
 from appointment_optimizer import AppointmentOptimizer, PatientInfo, OptimizationResult
-from infermedica_client import InfermedicaClient
+from appointment_matcher import AppointmentScore
+from infermedica_client import InfermedicaClient, normalize_symptom_text
 
 # Page config
 st.set_page_config(
@@ -15,9 +19,293 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# Custom CSS
-st.markdown(
+# Repeat clicks for the same query this soon after it finished are ignored
+SEARCH_DEBOUNCE_SECONDS = 0.5
+
+# HTML templates for the result view, filled with str.format_map per result
+ASSESSMENT_CARDS_HTML = """
+<div class="card-row">
+    <div class="metric-card"><p style="color: #666; font-size: 0.9rem;">Urgency Level</p><p class="{urgency_class}" style="font-size: 1.5rem;">{urgency_icon} {urgency_display}</p></div>
+    <div class="metric-card"><p style="color: #666; font-size: 0.9rem;">Recommended Specialist</p><p style="font-size: 1.2rem; font-weight: bold;">🩺 {specialist_name}</p></div>
+    <div class="metric-card"><p style="color: #666; font-size: 0.9rem;">Parsed Symptoms</p><p style="font-size: 1.2rem; font-weight: bold;">📝 {symptom_count}</p></div>
+</div>
+"""
+
+BEST_MATCH_HTML = """
+<div class="appointment-card best-match">
+    <h4>🏆 BEST MATCH - Fit Score: {fit_score}/100</h4>
+</div>
+"""
+
+
+@st.cache_resource
+def get_client() -> InfermedicaClient:
+    """Build the Infermedica client once per process and share it across reruns"""
+    return InfermedicaClient()
+
+
+@st.cache_resource
+def get_optimizer() -> AppointmentOptimizer:
+    """Build the optimizer once per process, reusing the cached client"""
+    return AppointmentOptimizer(client=get_client())
+
+
+def run_optimization(age: int, sex: str, symptom_text: str) -> OptimizationResult:
+    """Run the optimization pipeline
+
+    Not memoized here: the shared optimizer already reuses assessments for
+    repeated queries, while slots and time-relative scores stay current.
     """
+    patient = PatientInfo(age=age, sex=sex, symptom_text=symptom_text)
+    return get_optimizer().optimize(patient)
+
+
+def format_recommendation(rec: AppointmentScore) -> Dict:
+    """Flatten one recommendation into the pre-formatted strings the UI shows"""
+    provider = rec.slot.provider
+    return {
+        "provider_name": provider.name,
+        "specialty": provider.specialty.value,
+        "location": provider.location,
+        "rating": provider.rating,
+        "years_experience": provider.years_experience,
+        "fit_score": int(rec.total_score * 100),
+        "date": rec.appointment_datetime.strftime("%A, %B %d"),
+        "time": rec.appointment_datetime.strftime("%I:%M %p"),
+        "cost": rec.slot.cost_estimate,
+        "duration": rec.slot.duration_minutes,
+        "reasoning_md": "\n".join(
+            f"- {line.strip()}" for line in rec.reasoning if line.strip()
+        ),
+    }
+
+
+def build_result_view(result: OptimizationResult) -> Dict:
+    """
+    Reduce an OptimizationResult to the plain dict the results view renders
+
+    Only this dict is kept in session_state, so reruns don't carry the full
+    dataclass graph around
+    """
+    urgency = result.triage.triage_level.value
+
+    # Color code by urgency
+    if "emergency" in urgency:
+        urgency_class = "urgency-emergency"
+        urgency_icon = "🚨"
+    elif "consultation" in urgency:
+        urgency_class = "urgency-consultation"
+        urgency_icon = "⚠️"
+    else:
+        urgency_class = "urgency-self-care"
+        urgency_icon = "✅"
+
+    return {
+        "urgency_class": urgency_class,
+        "urgency_icon": urgency_icon,
+        "urgency_display": urgency.replace("_", " ").title(),
+        "specialist_name": result.specialist.specialist_name,
+        "symptoms": [symptom.common_name for symptom in result.parsed_symptoms],
+        "appointments": [
+            format_recommendation(rec) for rec in result.recommended_appointments
+        ],
+        "alternatives": result.alternative_options,
+    }
+
+
+def show_alternatives():
+    """Button callback: reveal the alternative appointments"""
+    st.session_state.show_alternatives = True
+
+
+def render_appointment(appt: Dict, key: str, best: bool = False):
+    """Shared layout for the best match and each alternative appointment"""
+    if best:
+        st.markdown(
+            BEST_MATCH_HTML.format_map({"fit_score": appt["fit_score"]}),
+            unsafe_allow_html=True,
+        )
+
+    heading = "###" if best else "####"
+    provider_md = (
+        f"{heading} {appt['provider_name']}\n\n"
+        f"**{appt['specialty']}**\n\n"
+        f"📍 {appt['location']}"
+    )
+    if appt["rating"]:
+        stars = "⭐" * int(appt["rating"])
+        provider_md += f"\n\n{stars} {appt['rating']}/5.0 ({appt['years_experience']} years experience)"
+
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.markdown(provider_md)
+
+    with col2:
+        st.markdown(
+            f"#### 📅 {appt['date']}\n"
+            f"#### 🕐 {appt['time']}\n"
+            f"#### 💰 ${appt['cost']}\n\n"
+            f"⏱️ {appt['duration']} minutes"
+        )
+
+    reasoning_title = "Why this is recommended" if best else "Reasoning"
+    st.markdown(f"**{reasoning_title}:**\n\n{appt['reasoning_md']}")
+
+    st.button(
+        "📅 Schedule Appointment" if best else "📅 Schedule",
+        type="primary" if best else "secondary",
+        key=key,
+    )
+
+
+@st.fragment
+def render_results(view: Dict):
+    """
+    Render the assessment, recommended appointments and care alternatives
+
+    Runs as a fragment, so toggling widgets inside it (e.g. "Show parsed
+    symptoms") only reruns this block instead of the whole page
+    """
+    st.divider()
+
+    # Triage Assessment
+    st.subheader("📋 Clinical Assessment")
+
+    # All three cards go out in a single markdown call
+    st.markdown(
+        ASSESSMENT_CARDS_HTML.format_map(
+            {
+                "urgency_class": view["urgency_class"],
+                "urgency_icon": view["urgency_icon"],
+                "urgency_display": view["urgency_display"],
+                "specialist_name": view["specialist_name"],
+                "symptom_count": len(view["symptoms"]),
+            }
+        ),
+        unsafe_allow_html=True,
+    )
+
+    # Show parsed symptoms
+    if st.checkbox("Show parsed symptoms", value=False):
+        st.write("**Identified symptoms:**")
+        for symptom in view["symptoms"]:
+            st.write(f"• {symptom}")
+
+    st.divider()
+
+    # Appointments
+    st.subheader("🎯 Recommended Appointments")
+
+    appointments = view["appointments"]
+
+    if appointments:
+        # Best match highlight
+        with st.container():
+            render_appointment(appointments[0], key="schedule_best", best=True)
+
+        # Other options (rendered on demand; most users only read the best match)
+        alternatives = appointments[1:4]
+        if alternatives:
+            st.markdown("### Alternative Options")
+
+            if not st.session_state.show_alternatives:
+                st.button(
+                    f"Show {len(alternatives)} more options",
+                    on_click=show_alternatives,
+                )
+            else:
+                for i, appt in enumerate(alternatives, 2):
+                    with st.expander(
+                        f"{i}. {appt['provider_name']} - {appt['specialty']} (Score: {appt['fit_score']}/100)"
+                    ):
+                        render_appointment(appt, key=f"schedule_{i}")
+
+    else:
+        st.warning("No appointments found matching your criteria")
+
+    # Alternative care options
+    if view["alternatives"]:
+        st.divider()
+        st.subheader("💡 Alternative Care Options")
+
+        cols = st.columns(len(view["alternatives"]))
+
+        for col, alt in zip(cols, view["alternatives"]):
+            with col.container(border=True):
+                st.markdown(f"#### {'⭐ ' if alt['recommended'] else ''}{alt['name']}")
+                st.metric("Cost", alt["cost_range"])
+                st.caption(
+                    f"Available: {alt['availability']} · Best for: {alt['best_for']}"
+                )
+
+
+@st.cache_data
+def about_overview_md() -> str:
+    """About tab, left column (static, dedented once per process)"""
+    return textwrap.dedent(
+        """
+        ### 🎯 What It Does
+        
+        This AI-powered system combines clinical triage with intelligent 
+        appointment matching to route patients to the right care at the right time.
+        
+        **Key Features:**
+        - 🩺 Medical-grade symptom assessment (Infermedica AI)
+        - ⚡ 5-level urgency triage
+        - 🎯 Smart appointment matching algorithm
+        - 💰 Cost transparency
+        - 📊 Alternative care options
+        
+        ### 🔬 Technology Stack
+        
+        - **Clinical AI:** Infermedica Engine API
+        - **Matching:** Custom scoring algorithm
+        - **Backend:** Python, FastAPI
+        - **Frontend:** Streamlit
+        """
+    )
+
+
+@st.cache_data
+def about_matching_md() -> str:
+    """About tab, right column (static, dedented once per process)"""
+    return textwrap.dedent(
+        """
+        ### 📈 How Matching Works
+        
+        Appointments are scored based on three factors:
+        
+        **1. Urgency Match (50%)**
+        - Emergency → Must be within 24 hours
+        - Consultation → Within 2 weeks acceptable
+        
+        **2. Specialist Match (30%)**
+        - Exact specialty match = 1.0
+        - Primary care fallback = 0.7
+        
+        **3. Availability (20%)**
+        - Sooner is better for urgent cases
+        - Flexible for routine care
+        
+        ### 🔐 Privacy & Security
+        
+        - No personal data stored
+        - HIPAA-compliant architecture ready
+        - Secure API communication
+        - Session-based processing
+        
+        ### 📧 Contact
+        
+        **Eric McLean**  
+        Senior Delivery Manager | Healthcare AI  
+        [eric-mclean.com](https://eric-mclean.com)
+        """
+    )
+
+
+# Custom CSS (module constant so the element is identical across reruns)
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -31,6 +319,13 @@ st.markdown(
         border-radius: 0.5rem;
         margin: 0.5rem 0;
     }
+    .card-row {
+        display: flex;
+        gap: 1rem;
+    }
+    .card-row > .metric-card {
+        flex: 1;
+    }
     .appointment-card {
         border: 2px solid #e0e0e0;
         padding: 1rem;
@@ -54,15 +349,17 @@ st.markdown(
         font-weight: bold;
     }
 </style>
-""",
-    unsafe_allow_html=True,
-)
+"""
+
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Initialize session state
-if "optimization_result" not in st.session_state:
-    st.session_state.optimization_result = None
-if "show_details" not in st.session_state:
-    st.session_state.show_details = False
+if "result_view" not in st.session_state:
+    st.session_state.result_view = None
+if "last_search" not in st.session_state:
+    st.session_state.last_search = None
+if "show_alternatives" not in st.session_state:
+    st.session_state.show_alternatives = False
 
 # Header
 st.markdown(
@@ -122,44 +419,62 @@ with tab1:
     # Symptom input
     st.subheader("What symptoms are you experiencing?")
 
-    symptom_text = st.text_area(
-        "Describe your symptoms",
-        placeholder="e.g., I have chest pain and feel dizzy when I stand up",
-        height=100,
-        help="Describe your symptoms in your own words. Be specific about location, duration, and severity.",
-    )
+    # Inputs live in a form so typing doesn't trigger reruns; the page only
+    # reruns on explicit submit
+    with st.form("symptom_query", border=False):
+        symptom_text = st.text_area(
+            "Describe your symptoms",
+            placeholder="e.g., I have chest pain and feel dizzy when I stand up",
+            height=100,
+            help="Describe your symptoms in your own words. Be specific about location, duration, and severity.",
+        )
 
-    # Action buttons
-    col1, col2, col3 = st.columns([2, 1, 1])
+        col1, col2, col3 = st.columns([2, 1, 1])
 
-    with col1:
-        search_button = st.button(
-            "🔍 Find Optimal Appointment", type="primary", use_container_width=True
-        )
+        with col1:
+            search_button = st.form_submit_button(
+                "🔍 Find Optimal Appointment", type="primary", use_container_width=True
+            )
 
-    with col2:
-        if st.session_state.optimization_result:
+    # Clear can't be a form button, so it sits in its own row
+    if st.session_state.result_view:
+        col1, col2, col3 = st.columns([2, 1, 1])
+
+        with col1:
             clear_button = st.button("🔄 Clear", use_container_width=True)
             if clear_button:
-                st.session_state.optimization_result = None
+                st.session_state.result_view = None
+                st.session_state.show_alternatives = False
                 st.rerun()
 
     # Process search
+    search_failed = False
     if search_button:
+        # Retyped text that only differs in case or spacing counts as a repeat
+        query = (age, sex, normalize_symptom_text(symptom_text))
+        last_search = st.session_state.last_search
+
         if not symptom_text.strip():
             st.error("⚠️ Please describe your symptoms")
+            search_failed = True
+        elif (
+            last_search is not None
+            and last_search[0] == query
+            and time.monotonic() - last_search[1] < SEARCH_DEBOUNCE_SECONDS
+        ):
+            # Double-click: the rerun it queued lands right after the first
+            # search finished, so just show that result again
+            st.toast("⏳ Already showing results for this search")
         else:
             try:
                 with st.spinner("🔄 Analyzing symptoms and finding appointments..."):
-                    # Create patient info
-                    patient = PatientInfo(age=age, sex=sex, symptom_text=symptom_text)
+                    # Run optimization, sending the text as typed
+                    result = run_optimization(age, sex, symptom_text.strip())
 
-                    # Run optimization
-                    optimizer = AppointmentOptimizer()
-                    result = optimizer.optimize(patient)
-
-                    # Store in session state
-                    st.session_state.optimization_result = result
+                    # Store only the pre-formatted view in session state
+                    st.session_state.result_view = build_result_view(result)
+                    st.session_state.show_alternatives = False
+                    st.session_state.last_search = (query, time.monotonic())
                     st.success("✅ Analysis complete!")
 
             except Exception as e:
@@ -167,164 +482,12 @@ with tab1:
                 st.info(
                     "💡 Note: This requires Infermedica API credentials. Add INFERMEDICA_APP_ID and INFERMEDICA_APP_KEY to your .env file."
                 )
+                search_failed = True
 
-    # Display results
-    if st.session_state.optimization_result:
-        result = st.session_state.optimization_result
-
-        st.divider()
-
-        # Triage Assessment
-        st.subheader("📋 Clinical Assessment")
-
-        col1, col2, col3 = st.columns(3)
-
-        with col1:
-            urgency = result.triage.triage_level.value
-            urgency_display = urgency.replace("_", " ").title()
-
-            # Color code by urgency
-            if "emergency" in urgency:
-                urgency_class = "urgency-emergency"
-                urgency_icon = "🚨"
-            elif "consultation" in urgency:
-                urgency_class = "urgency-consultation"
-                urgency_icon = "⚠️"
-            else:
-                urgency_class = "urgency-self-care"
-                urgency_icon = "✅"
-
-            st.markdown(
-                f'<div class="metric-card"><p style="color: #666; font-size: 0.9rem;">Urgency Level</p><p class="{urgency_class}" style="font-size: 1.5rem;">{urgency_icon} {urgency_display}</p></div>',
-                unsafe_allow_html=True,
-            )
-
-        with col2:
-            st.markdown(
-                f'<div class="metric-card"><p style="color: #666; font-size: 0.9rem;">Recommended Specialist</p><p style="font-size: 1.2rem; font-weight: bold;">🩺 {result.triage.recommended_specialist_name}</p></div>',
-                unsafe_allow_html=True,
-            )
-
-        with col3:
-            st.markdown(
-                f'<div class="metric-card"><p style="color: #666; font-size: 0.9rem;">Parsed Symptoms</p><p style="font-size: 1.2rem; font-weight: bold;">📝 {len(result.parsed_symptoms)}</p></div>',
-                unsafe_allow_html=True,
-            )
-
-        # Show parsed symptoms
-        if st.checkbox("Show parsed symptoms", value=False):
-            st.write("**Identified symptoms:**")
-            for symptom in result.parsed_symptoms:
-                st.write(f"• {symptom.common_name}")
-
-        st.divider()
-
-        # Appointments
-        st.subheader("🎯 Recommended Appointments")
-
-        if result.recommended_appointments:
-            # Best match highlight
-            best = result.recommended_appointments[0]
-
-            with st.container():
-                st.markdown(
-                    f"""
-                <div class="appointment-card best-match">
-                    <h4>🏆 BEST MATCH - Fit Score: {int(best.total_score * 100)}/100</h4>
-                </div>
-                """,
-                    unsafe_allow_html=True,
-                )
-
-                col1, col2 = st.columns([2, 1])
-
-                with col1:
-                    st.markdown(f"### {best.slot.provider.name}")
-                    st.markdown(f"**{best.slot.provider.specialty.value}**")
-                    st.markdown(f"📍 {best.slot.provider.location}")
-
-                    if best.slot.provider.rating:
-                        stars = "⭐" * int(best.slot.provider.rating)
-                        st.markdown(
-                            f"{stars} {best.slot.provider.rating}/5.0 ({best.slot.provider.years_experience} years experience)"
-                        )
-
-                with col2:
-                    st.markdown(f"#### 📅 {best.slot.datetime.strftime('%A, %B %d')}")
-                    st.markdown(f"#### 🕐 {best.slot.datetime.strftime('%I:%M %p')}")
-                    st.markdown(f"#### 💰 ${best.slot.cost_estimate}")
-                    st.markdown(f"⏱️ {best.slot.duration_minutes} minutes")
-
-                st.markdown("**Why this is recommended:**")
-                for line in best.reasoning.split("\n"):
-                    if line.strip():
-                        st.markdown(f"{line}")
-
-                st.button(
-                    "📅 Schedule Appointment", type="primary", key="schedule_best"
-                )
-
-            # Other options
-            if len(result.recommended_appointments) > 1:
-                st.markdown("### Alternative Options")
-
-                for i, rec in enumerate(result.recommended_appointments[1:4], 2):
-                    with st.expander(
-                        f"{i}. {rec.slot.provider.name} - {rec.slot.provider.specialty.value} (Score: {int(rec.total_score * 100)}/100)"
-                    ):
-                        col1, col2 = st.columns([2, 1])
-
-                        with col1:
-                            st.write(f"**Provider:** {rec.slot.provider.name}")
-                            st.write(
-                                f"**Specialty:** {rec.slot.provider.specialty.value}"
-                            )
-                            st.write(f"**Location:** {rec.slot.provider.location}")
-                            if rec.slot.provider.rating:
-                                st.write(f"**Rating:** {rec.slot.provider.rating}/5.0")
-
-                        with col2:
-                            st.write(
-                                f"**Date:** {rec.slot.datetime.strftime('%A, %B %d')}"
-                            )
-                            st.write(
-                                f"**Time:** {rec.slot.datetime.strftime('%I:%M %p')}"
-                            )
-                            st.write(f"**Cost:** ${rec.slot.cost_estimate}")
-                            st.write(f"**Duration:** {rec.slot.duration_minutes} min")
-
-                        st.markdown("**Reasoning:**")
-                        for line in rec.reasoning.split("\n"):
-                            if line.strip():
-                                st.write(line)
-
-                        st.button(f"📅 Schedule", key=f"schedule_{i}")
-
-        else:
-            st.warning("No appointments found matching your criteria")
-
-        # Alternative care options
-        if result.alternative_options:
-            st.divider()
-            st.subheader("💡 Alternative Care Options")
-
-            cols = st.columns(len(result.alternative_options))
-
-            for idx, alt in enumerate(result.alternative_options):
-                with cols[idx]:
-                    cost_min, cost_max = alt["cost_range"]
-
-                    st.markdown(
-                        f"""
-                    <div class="metric-card">
-                        <h4>{alt['icon']} {alt['type']}</h4>
-                        <p><strong>Available:</strong> {alt['availability']}</p>
-                        <p><strong>Cost:</strong> ${cost_min}-${cost_max}</p>
-                        <p><strong>Wait:</strong> {alt['wait_time']}</p>
-                    </div>
-                    """,
-                        unsafe_allow_html=True,
-                    )
+    # Display results (skipped when this run's search failed, so a stale
+    # result isn't rendered under the error)
+    if st.session_state.result_view and not search_failed:
+        render_results(st.session_state.result_view)
 
 with tab2:
     st.subheader("About This System")
@@ -332,62 +495,10 @@ with tab2:
     col1, col2 = st.columns(2)
 
     with col1:
-        st.markdown(
-            """
-        ### 🎯 What It Does
-        
-        This AI-powered system combines clinical triage with intelligent 
-        appointment matching to route patients to the right care at the right time.
-        
-        **Key Features:**
-        - 🩺 Medical-grade symptom assessment (Infermedica AI)
-        - ⚡ 5-level urgency triage
-        - 🎯 Smart appointment matching algorithm
-        - 💰 Cost transparency
-        - 📊 Alternative care options
-        
-        ### 🔬 Technology Stack
-        
-        - **Clinical AI:** Infermedica Engine API
-        - **Matching:** Custom scoring algorithm
-        - **Backend:** Python, FastAPI
-        - **Frontend:** Streamlit
-        """
-        )
+        st.markdown(about_overview_md())
 
     with col2:
-        st.markdown(
-            """
-        ### 📈 How Matching Works
-        
-        Appointments are scored based on three factors:
-        
-        **1. Urgency Match (50%)**
-        - Emergency → Must be within 24 hours
-        - Consultation → Within 2 weeks acceptable
-        
-        **2. Specialist Match (30%)**
-        - Exact specialty match = 1.0
-        - Primary care fallback = 0.7
-        
-        **3. Availability (20%)**
-        - Sooner is better for urgent cases
-        - Flexible for routine care
-        
-        ### 🔐 Privacy & Security
-        
-        - No personal data stored
-        - HIPAA-compliant architecture ready
-        - Secure API communication
-        - Session-based processing
-        
-        ### 📧 Contact
-        
-        **Eric McLean**  
-        Senior Delivery Manager | Healthcare AI  
-        [eric-mclean.com](https://eric-mclean.com)
-        """
-        )
+        st.markdown(about_matching_md())
 
     st.divider()
 
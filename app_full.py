@@ -3,19 +3,23 @@ Interactive Multi-Turn Streamlit UI for Appointment Optimizer
 Implements full Infermedica interview flow with state management
 """
 
+import traceback
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from interview_manager import InterviewManager, InterviewStage
 from infermedica_client import InfermedicaClient
-from appointment_optimizer import AppointmentOptimizer
+from appointment_optimizer import map_specialist_to_specialty
+from appointment_simulator import AppointmentSimulator
+from appointment_matcher import AppointmentMatcher
 
 # Page config
 st.set_page_config(
     page_title="Appointment Optimizer - Full Interview", page_icon="🏥", layout="wide"
 )
 
-# Custom CSS
-st.markdown(
-    """
+# Custom CSS (module constant so the element is identical across reruns)
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -56,9 +60,46 @@ st.markdown(
         margin: 2rem 0;
     }
 </style>
-""",
-    unsafe_allow_html=True,
-)
+"""
+
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+
+# Radio answers and the Infermedica choice_id each one maps to
+CHOICE_MAP = {"Yes": "present", "No": "absent", "Unknown": "unknown"}
+CHOICE_OPTIONS = list(CHOICE_MAP)
+
+# Rough completion percentage shown in the sidebar for each interview stage
+STAGE_PROGRESS = {
+    "initial_symptoms": 10,
+    "risk_factors": 30,
+    "related_symptoms": 50,
+    "red_flags": 70,
+    "interview_loop": 85,
+    "complete": 100,
+}
+
+
+@st.cache_resource
+def get_client() -> InfermedicaClient:
+    """Build the Infermedica client once per process and share it across sessions"""
+    return InfermedicaClient()
+
+
+@st.cache_resource
+def get_simulator() -> AppointmentSimulator:
+    """Shared simulator, so each day's generated schedules are reused"""
+    return AppointmentSimulator()
+
+
+@st.cache_resource
+def get_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for prefetching interview questions
+
+    Its threads have no ScriptRunContext, so submit client calls to it,
+    never Streamlit functions such as st.cache_data wrappers.
+    """
+    return ThreadPoolExecutor(max_workers=4)
 
 
 def initialize_session_state():
@@ -76,6 +117,10 @@ def initialize_session_state():
         st.session_state.pending_related_symptoms = []
         st.session_state.pending_red_flags = []
         st.session_state.current_question = None
+        st.session_state.pending_question = None
+
+        # Background /suggest calls for upcoming stages, by stage
+        st.session_state.prefetched = {}
 
         # Final results
         st.session_state.final_results = None
@@ -132,20 +177,8 @@ def render_sidebar():
             st.metric("Questions Asked", progress["questions_asked"])
             st.metric("Evidence Collected", progress["evidence_count"])
 
-            # Progress bar
-            if progress["stage"] == "complete":
-                st.progress(100)
-            else:
-                # Estimate progress based on stage
-                stage_progress = {
-                    "initial_symptoms": 10,
-                    "risk_factors": 30,
-                    "related_symptoms": 50,
-                    "red_flags": 70,
-                    "interview_loop": 85,
-                    "complete": 100,
-                }
-                st.progress(stage_progress.get(progress["stage"], 0))
+            # Progress bar (estimated from the stage)
+            st.progress(STAGE_PROGRESS.get(progress["stage"], 0))
 
         st.markdown("---")
 
@@ -169,10 +202,11 @@ def render_sidebar():
         # Reset button
         if st.session_state.manager:
             st.markdown("---")
-            if st.button("🔄 Start New Interview", type="secondary"):
-                for key in list(st.session_state.keys()):
-                    del st.session_state[key]
-                st.rerun()
+            st.button(
+                "🔄 Start New Interview",
+                type="secondary",
+                on_click=st.session_state.clear,
+            )
 
 
 def render_stage_1_initial_symptoms():
@@ -200,12 +234,20 @@ def render_stage_1_initial_symptoms():
 
             # Initialize client and manager
             try:
-                st.session_state.client = InfermedicaClient()
+                st.session_state.client = get_client()
                 st.session_state.symptom_text = symptom_text
 
+                # Risk factors only depend on age and sex, so fetch them
+                # while the symptoms are parsed rather than after the rerun
+                st.session_state.prefetched["risk_factors"] = get_executor().submit(
+                    st.session_state.client.suggest_risk_factors,
+                    age=st.session_state.patient_age,
+                    sex=st.session_state.patient_sex,
+                )
+
                 # Parse symptoms
                 with st.spinner("Analyzing symptoms..."):
-                    parsed = st.session_state.client.parse_symptoms(
+                    parsed = get_client().parse_symptoms(
                         symptom_text,
                         st.session_state.patient_age,
                         st.session_state.patient_sex,
@@ -251,6 +293,104 @@ def render_stage_1_initial_symptoms():
         )
 
 
+def record_form_responses(
+    pending_key: str, key_prefix: str, add_responses, prefetch=None
+):
+    """Form submit callback: record all radio answers and clear the pending list
+
+    Runs before the script reruns, so the single rerun triggered by the
+    submit already sees the next stage. prefetch, if given, starts loading
+    that stage's suggestions now that the evidence is complete.
+    """
+    responses = {}
+    for item in st.session_state[pending_key]:
+        answer = st.session_state[f"{key_prefix}_{item.get('id')}"]
+        responses[item.get("id")] = CHOICE_MAP[answer]
+
+    add_responses(responses)
+    st.session_state[pending_key] = []
+
+    if prefetch is not None:
+        prefetch()
+
+
+def prefetch_related_symptoms():
+    """Start fetching stage 3's related symptoms in the background"""
+    manager = st.session_state.manager
+    st.session_state.prefetched["related_symptoms"] = get_executor().submit(
+        manager.client.suggest_related_symptoms,
+        evidence=list(manager.state.evidence),
+        age=manager.state.patient_age,
+        sex=manager.state.patient_sex,
+        interview_id=manager.state.interview_id,
+    )
+
+
+def prefetch_red_flags():
+    """Start fetching stage 4's red flags in the background"""
+    manager = st.session_state.manager
+    st.session_state.prefetched["red_flags"] = get_executor().submit(
+        manager.client.suggest_red_flags,
+        evidence=list(manager.state.evidence),
+        age=manager.state.patient_age,
+        sex=manager.state.patient_sex,
+        interview_id=manager.state.interview_id,
+    )
+
+
+def take_prefetched(key: str) -> Optional[List[Dict]]:
+    """Wait for the suggestions prefetched under key, or None if none were"""
+    future = st.session_state.prefetched.pop(key, None)
+    return future.result() if future is not None else None
+
+
+def record_answers(answers: Dict[str, str]):
+    """Record the answers to the current question and prefetch the next one"""
+    manager = st.session_state.manager
+    for item_id, choice in answers.items():
+        manager.answer_question(item_id, choice)
+    st.session_state.current_question = None
+
+    # Start fetching the next question now so the /diagnosis round-trip
+    # overlaps with the rerun that redraws the page
+    st.session_state.pending_question = get_executor().submit(manager.get_next_question)
+
+
+def record_choice_answer(item_id: str):
+    """Button callback: record the Yes/No/Unknown radio for a single item
+
+    Reads the widget from session state at click time; values bound with
+    args= would be the ones from the previous render.
+    """
+    record_answers({item_id: CHOICE_MAP[st.session_state[f"q_{item_id}"]]})
+
+
+def record_group_single_answer(widget_key: str, item_ids: List[str]):
+    """Button callback: the selected item is present, all others absent"""
+    selected_id = st.session_state[widget_key]
+    if selected_id is None:
+        return
+
+    record_answers(
+        {
+            item_id: "present" if item_id == selected_id else "absent"
+            for item_id in item_ids
+        }
+    )
+
+
+def record_group_multiple_answers(item_ids: List[str]):
+    """Button callback: checked items are present, the rest absent"""
+    answers = {
+        item_id: "present" if st.session_state[f"q_multi_{item_id}"] else "absent"
+        for item_id in item_ids
+    }
+
+    # Require at least one selection
+    if "present" in answers.values():
+        record_answers(answers)
+
+
 def render_stage_2_risk_factors():
     """Stage 2: Collect risk factors"""
     st.markdown(
@@ -263,16 +403,14 @@ def render_stage_2_risk_factors():
     # Load risk factors if not already loaded
     if not st.session_state.pending_risk_factors:
         with st.spinner("Checking risk factors..."):
-            risk_factors = manager.collect_risk_factors()
+            risk_factors = manager.collect_risk_factors(take_prefetched("risk_factors"))
             st.session_state.pending_risk_factors = risk_factors
 
     risk_factors = st.session_state.pending_risk_factors
 
     if not risk_factors:
         st.info("No risk factors to check")
-        if st.button("Continue →"):
-            st.session_state.pending_risk_factors = []
-            st.rerun()
+        st.button("Continue →")
         return
 
     st.write(
@@ -280,33 +418,27 @@ def render_stage_2_risk_factors():
     )
 
     # Create form for all risk factors
-    with st.form("risk_factors_form"):
-        responses = {}
-
+    with st.form("risk_factors_form", clear_on_submit=True):
         for i, rf in enumerate(risk_factors):
-            st.markdown(f'<div class="question-card">', unsafe_allow_html=True)
-            response = st.radio(
+            st.radio(
                 f"**{i+1}. Do you have {rf.get('name')}?**",
-                ["Yes", "No", "Unknown"],
+                CHOICE_OPTIONS,
                 index=1,  # Default to "No"
                 key=f"rf_{rf.get('id')}",
                 horizontal=True,
             )
-            responses[rf.get("id")] = response
-            st.markdown("</div>", unsafe_allow_html=True)
-
-        submitted = st.form_submit_button("Continue →", type="primary")
-
-        if submitted:
-            # Add all responses
-            for rf_id, response in responses.items():
-                choice_map = {"Yes": "present", "No": "absent", "Unknown": "unknown"}
-                manager.add_risk_factor_response(rf_id, choice_map[response])
 
-            # Clear pending and move to next stage
-            st.session_state.pending_risk_factors = []
-            st.success(f"✓ Recorded {len(responses)} responses")
-            st.rerun()
+        st.form_submit_button(
+            "Continue →",
+            type="primary",
+            on_click=record_form_responses,
+            args=(
+                "pending_risk_factors",
+                "rf",
+                manager.add_risk_factor_responses,
+                prefetch_related_symptoms,
+            ),
+        )
 
 
 def render_stage_3_related_symptoms():
@@ -321,16 +453,16 @@ def render_stage_3_related_symptoms():
     # Load related symptoms if not already loaded
     if not st.session_state.pending_related_symptoms:
         with st.spinner("Finding related symptoms..."):
-            related = manager.collect_related_symptoms()
+            related = manager.collect_related_symptoms(
+                take_prefetched("related_symptoms")
+            )
             st.session_state.pending_related_symptoms = related
 
     related = st.session_state.pending_related_symptoms
 
     if not related:
         st.info("No related symptoms to check")
-        if st.button("Continue →"):
-            st.session_state.pending_related_symptoms = []
-            st.rerun()
+        st.button("Continue →")
         return
 
     st.write(
@@ -338,33 +470,27 @@ def render_stage_3_related_symptoms():
     )
 
     # Create form for all related symptoms
-    with st.form("related_symptoms_form"):
-        responses = {}
-
+    with st.form("related_symptoms_form", clear_on_submit=True):
         for i, sym in enumerate(related):
-            st.markdown(f'<div class="question-card">', unsafe_allow_html=True)
-            response = st.radio(
+            st.radio(
                 f"**{i+1}. Do you have {sym.get('name')}?**",
-                ["Yes", "No", "Unknown"],
+                CHOICE_OPTIONS,
                 index=1,  # Default to "No"
                 key=f"rs_{sym.get('id')}",
                 horizontal=True,
             )
-            responses[sym.get("id")] = response
-            st.markdown("</div>", unsafe_allow_html=True)
-
-        submitted = st.form_submit_button("Continue →", type="primary")
 
-        if submitted:
-            # Add all responses
-            for sym_id, response in responses.items():
-                choice_map = {"Yes": "present", "No": "absent", "Unknown": "unknown"}
-                manager.add_related_symptom_response(sym_id, choice_map[response])
-
-            # Clear pending and move to next stage
-            st.session_state.pending_related_symptoms = []
-            st.success(f"✓ Recorded {len(responses)} responses")
-            st.rerun()
+        st.form_submit_button(
+            "Continue →",
+            type="primary",
+            on_click=record_form_responses,
+            args=(
+                "pending_related_symptoms",
+                "rs",
+                manager.add_related_symptom_responses,
+                prefetch_red_flags,
+            ),
+        )
 
 
 def render_stage_4_red_flags():
@@ -379,16 +505,14 @@ def render_stage_4_red_flags():
     # Load red flags if not already loaded
     if not st.session_state.pending_red_flags:
         with st.spinner("Checking for red flags..."):
-            red_flags = manager.check_red_flags()
+            red_flags = manager.check_red_flags(take_prefetched("red_flags"))
             st.session_state.pending_red_flags = red_flags
 
     red_flags = st.session_state.pending_red_flags
 
     if not red_flags:
         st.success("✓ No red flag symptoms detected")
-        if st.button("Continue →"):
-            st.session_state.pending_red_flags = []
-            st.rerun()
+        st.button("Continue →")
         return
 
     st.warning(
@@ -396,33 +520,45 @@ def render_stage_4_red_flags():
     )
 
     # Create form for all red flags
-    with st.form("red_flags_form"):
-        responses = {}
-
+    with st.form("red_flags_form", clear_on_submit=True):
         for i, rf in enumerate(red_flags):
-            st.markdown(f'<div class="question-card">', unsafe_allow_html=True)
-            response = st.radio(
+            st.radio(
                 f"**⚠️ {i+1}. {rf.get('name')}?**",
-                ["Yes", "No", "Unknown"],
+                CHOICE_OPTIONS,
                 index=1,  # Default to "No"
                 key=f"redf_{rf.get('id')}",
                 horizontal=True,
             )
-            responses[rf.get("id")] = response
-            st.markdown("</div>", unsafe_allow_html=True)
 
-        submitted = st.form_submit_button("Continue →", type="primary")
+        st.form_submit_button(
+            "Continue →",
+            type="primary",
+            on_click=record_form_responses,
+            args=("pending_red_flags", "redf", manager.add_red_flag_responses),
+        )
+
+
+def collect_prefetched_question():
+    """Wait for the question prefetched by record_answers, if any"""
+    if st.session_state.pending_question is None:
+        return
+
+    # Always drop the future, so a failed prefetch isn't re-raised on every
+    # rerun; stage 5 then fetches the question itself
+    try:
+        with st.spinner("Generating next question..."):
+            question = st.session_state.pending_question.result()
+    except Exception as e:
+        st.error(f"Couldn't load the next question: {e}")
+        return
+    finally:
+        st.session_state.pending_question = None
 
-        if submitted:
-            # Add all responses
-            for rf_id, response in responses.items():
-                choice_map = {"Yes": "present", "No": "absent", "Unknown": "unknown"}
-                manager.add_red_flag_response(rf_id, choice_map[response])
+    st.session_state.current_question = question
 
-            # Clear pending and move to next stage
-            st.session_state.pending_red_flags = []
-            st.success(f"✓ Recorded {len(responses)} responses")
-            st.rerun()
+    manager = st.session_state.manager
+    if manager.is_interview_complete() and not st.session_state.final_results:
+        st.session_state.final_results = manager.get_final_results()
 
 
 def render_stage_5_interview_loop():
@@ -472,86 +608,80 @@ def render_stage_5_interview_loop():
     if question.question_type == "single":
         # Single yes/no question
         item = question.items[0] if question.items else {}
-        response = st.radio(
+        st.radio(
             f"{item.get('name', 'Symptom')}",
-            ["Yes", "No", "Unknown"],
+            CHOICE_OPTIONS,
             key=f"q_{item.get('id')}",
             horizontal=True,
         )
 
-        if st.button("Next Question →", type="primary"):
-            choice_map = {"Yes": "present", "No": "absent", "Unknown": "unknown"}
-            manager.answer_question(item.get("id"), choice_map[response])
-            st.session_state.current_question = None
-            st.rerun()
+        st.button(
+            "Next Question →",
+            type="primary",
+            on_click=record_choice_answer,
+            args=(item.get("id"),),
+        )
 
     elif question.question_type == "group_single":
         # Multiple choice - select one option
-        options = [item.get("name") for item in question.items]
-        option_ids = [item.get("id") for item in question.items]
+        names = {item.get("id"): item.get("name") for item in question.items}
+        option_ids = list(names)
+        widget_key = f"q_group_{option_ids[0] if option_ids else 'none'}"
 
         selected = st.radio(
             "Select one answer",
-            options,
-            key=f"q_group_{question.items[0].get('id') if question.items else 'none'}",
+            option_ids,
+            format_func=names.get,
+            key=widget_key,
             index=None,  # No default selection
         )
 
-        if st.button("Next Question →", type="primary", disabled=(selected is None)):
-            # Find the selected item's ID
-            selected_index = options.index(selected)
-            selected_id = option_ids[selected_index]
-
-            # Mark selected as present, all others as absent
-            for item in question.items:
-                if item.get("id") == selected_id:
-                    manager.answer_question(item.get("id"), "present")
-                else:
-                    manager.answer_question(item.get("id"), "absent")
-
-            st.session_state.current_question = None
-            st.rerun()
+        # Mark selected as present, all others as absent
+        st.button(
+            "Next Question →",
+            type="primary",
+            disabled=(selected is None),
+            on_click=record_group_single_answer,
+            args=(widget_key, option_ids),
+        )
 
     elif question.question_type == "group_multiple":
         # Multiple selection - select one or more options
         st.markdown("**Select all that apply:**")
 
-        selected_ids = []
+        item_ids = [item.get("id") for item in question.items]
+        any_checked = False
 
         for item in question.items:
-            is_checked = st.checkbox(item.get("name"), key=f"q_multi_{item.get('id')}")
-            if is_checked:
-                selected_ids.append(item.get("id"))
+            if st.checkbox(item.get("name"), key=f"q_multi_{item.get('id')}"):
+                any_checked = True
 
         # Require at least one selection
-        if st.button(
-            "Next Question →", type="primary", disabled=(len(selected_ids) == 0)
-        ):
-            # Mark selected items as present, others as absent
-            for item in question.items:
-                if item.get("id") in selected_ids:
-                    manager.answer_question(item.get("id"), "present")
-                else:
-                    manager.answer_question(item.get("id"), "absent")
-
-            st.session_state.current_question = None
-            st.rerun()
+        # Mark selected items as present, others as absent
+        st.button(
+            "Next Question →",
+            type="primary",
+            disabled=not any_checked,
+            on_click=record_group_multiple_answers,
+            args=(item_ids,),
+        )
 
     else:
         # Fallback for unknown question types
         item = question.items[0] if question.items else {}
-        response = st.radio(
+        st.radio(
             f"{item.get('name', 'Symptom')}",
-            ["Yes", "No", "Unknown"],
+            CHOICE_OPTIONS,
             key=f"q_{item.get('id')}",
             horizontal=True,
         )
 
-        if st.button("Next Question →", type="primary"):
-            choice_map = {"Yes": "present", "No": "absent", "Unknown": "unknown"}
-            manager.answer_question(item.get("id"), choice_map[response])
-            st.session_state.current_question = None
-            st.rerun()
+        st.button(
+            "Next Question →",
+            type="primary",
+            on_click=record_choice_answer,
+            args=(item.get("id"),),
+        )
 
     st.markdown("</div>", unsafe_allow_html=True)
 
@@ -590,7 +720,9 @@ def render_appointment_results(results):
 
     st.write(f"**Top {len(appointments)} Appointment Options:**")
 
-    for i, appt in enumerate(appointments, 1):
+    for i, (appt, when) in enumerate(
+        zip(appointments, results["appointment_times"]), 1
+    ):
         with st.expander(
             f"#{i} - {appt.provider_name} ({appt.specialty}) - Score: {appt.total_score:.0%}",
             expanded=(i == 1),  # Expand first result
@@ -599,9 +731,7 @@ def render_appointment_results(results):
 
             with col1:
                 st.markdown(f"**📍 {appt.location}**")
-                st.markdown(
-                    f"**📅 {appt.appointment_datetime.strftime('%A, %B %d, %Y at %I:%M %p')}**"
-                )
+                st.markdown(f"**📅 {when}**")
                 st.markdown(f"**👨‍⚕️ {appt.provider_name}** - {appt.specialty}")
 
                 # Show reasoning
@@ -661,13 +791,24 @@ def render_stage_6_results():
     if results.get("conditions"):
         st.write(f"**Top {min(5, len(results['conditions']))} Possible Conditions:**")
 
-        for i, cond in enumerate(results["conditions"][:5], 1):
-            prob = cond.get("probability", 0) * 100
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.markdown(f"**{i}. {cond.get('common_name')}**")
-            with col2:
-                st.metric("Probability", f"{prob:.1f}%")
+        # One table element instead of a markdown + metric pair per condition
+        st.dataframe(
+            [
+                {
+                    "#": i,
+                    "Condition": cond.get("common_name"),
+                    "Probability": cond.get("probability", 0),
+                }
+                for i, cond in enumerate(results["conditions"][:5], 1)
+            ],
+            column_config={
+                "Probability": st.column_config.ProgressColumn(
+                    "Probability", format="percent", min_value=0, max_value=1
+                )
+            },
+            hide_index=True,
+            width="stretch",
+        )
 
     # Interview summary
     with st.expander("📋 Interview Summary"):
@@ -702,35 +843,17 @@ def render_stage_6_results():
                         top_condition = results["conditions"][0].get("common_name")
 
                     # Generate appointment recommendations
-                    from appointment_simulator import (
-                        AppointmentSimulator,
-                        SpecialtyType,
-                    )
-                    from appointment_matcher import AppointmentMatcher
-
-                    simulator = AppointmentSimulator()
+                    simulator = get_simulator()
                     matcher = AppointmentMatcher()
 
                     # Map specialist name to SpecialtyType enum
-                    specialty_map = {
-                        "general practitioner": SpecialtyType.PRIMARY_CARE,
-                        "primary care": SpecialtyType.PRIMARY_CARE,
-                        "cardiologist": SpecialtyType.CARDIOLOGY,
-                        "dermatologist": SpecialtyType.DERMATOLOGY,
-                        "orthopedist": SpecialtyType.ORTHOPEDICS,
-                        "neurologist": SpecialtyType.NEUROLOGY,
-                        "psychiatrist": SpecialtyType.PSYCHIATRY,
-                        "pediatrician": SpecialtyType.PEDIATRICS,
-                    }
-
-                    specialist_lower = specialist.specialist_name.lower()
-                    specialty_type = specialty_map.get(
-                        specialist_lower, SpecialtyType.PRIMARY_CARE
+                    specialty_type = map_specialist_to_specialty(
+                        specialist.specialist_name
                     )
 
                     # Generate slots for recommended specialist
                     slots = simulator.generate_slots(
-                        specialty=specialty_type, days_ahead=14
+                        specialty=specialty_type, days_ahead=14, available_only=True
                     )
 
                     # Score appointments (matcher now takes separate params)
@@ -747,14 +870,19 @@ def render_stage_6_results():
                         "specialist": specialist,
                         "top_condition": top_condition,
                         "appointments": scored,
+                        # Formatted once here rather than on every rerun
+                        "appointment_times": [
+                            appt.appointment_datetime.strftime(
+                                "%A, %B %d, %Y at %I:%M %p"
+                            )
+                            for appt in scored
+                        ],
                     }
 
                     st.rerun()
 
                 except Exception as e:
                     st.error(f"Error finding appointments: {e}")
-                    import traceback
-
                     st.code(traceback.format_exc())
 
     # Show appointment results if available
@@ -762,46 +890,61 @@ def render_stage_6_results():
         render_appointment_results(st.session_state.appointment_results)
 
 
+def render_after_risk_factors():
+    """Risk factor form until it is submitted, then related symptoms"""
+    if st.session_state.pending_risk_factors:
+        render_stage_2_risk_factors()
+    else:
+        render_stage_3_related_symptoms()
+
+
+def render_after_related_symptoms():
+    """Related symptom form until it is submitted, then red flags"""
+    if st.session_state.pending_related_symptoms:
+        render_stage_3_related_symptoms()
+    else:
+        render_stage_4_red_flags()
+
+
+def render_interview_loop():
+    """Diagnosis questions until the interview completes"""
+    if not st.session_state.manager.is_interview_complete():
+        render_stage_5_interview_loop()
+    else:
+        render_stage_6_results()
+
+
+# Page to render for each interview stage once the manager exists
+STAGE_RENDERERS = {
+    InterviewStage.INITIAL_SYMPTOMS: render_stage_2_risk_factors,
+    InterviewStage.RISK_FACTORS: render_after_risk_factors,
+    InterviewStage.RELATED_SYMPTOMS: render_after_related_symptoms,
+    InterviewStage.RED_FLAGS: render_interview_loop,
+    InterviewStage.INTERVIEW_LOOP: render_interview_loop,
+    InterviewStage.COMPLETE: render_stage_6_results,
+}
+
+
 def main():
     """Main app logic"""
     initialize_session_state()
     render_header()
+
+    # The sidebar progress and the stage routing both read the manager, and
+    # the prefetch can finish the interview, so settle it first
+    if st.session_state.manager:
+        collect_prefetched_question()
+
     render_sidebar()
 
     # Determine which stage to show
     if not st.session_state.manager:
         # Stage 1: Initial symptoms
         render_stage_1_initial_symptoms()
-
     else:
-        manager = st.session_state.manager
-        stage = manager.state.stage
-
-        if stage == InterviewStage.INITIAL_SYMPTOMS:
-            render_stage_2_risk_factors()
-
-        elif stage == InterviewStage.RISK_FACTORS:
-            if st.session_state.pending_risk_factors:
-                render_stage_2_risk_factors()
-            else:
-                render_stage_3_related_symptoms()
-
-        elif stage == InterviewStage.RELATED_SYMPTOMS:
-            if st.session_state.pending_related_symptoms:
-                render_stage_3_related_symptoms()
-            else:
-                render_stage_4_red_flags()
-
-        elif (
-            stage == InterviewStage.RED_FLAGS or stage == InterviewStage.INTERVIEW_LOOP
-        ):
-            if not manager.is_interview_complete():
-                render_stage_5_interview_loop()
-            else:
-                render_stage_6_results()
-
-        elif stage == InterviewStage.COMPLETE:
-            render_stage_6_results()
+        render_stage = STAGE_RENDERERS.get(st.session_state.manager.state.stage)
+        if render_stage:
+            render_stage()
 
 
 if __name__ == "__main__":
@@ -3,13 +3,17 @@ Appointment Matcher
 Scores and ranks appointments based on triage urgency and specialist match
 """
 
-from datetime import datetime, timedelta
-from typing import List, Dict
+import heapq
+from bisect import bisect_right
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, List, Dict, Tuple
 from dataclasses import dataclass
-from appointment_simulator import AppointmentSlot
+from appointment_simulator import AppointmentSlot, epoch_seconds
+from triage_levels import TriageLevel
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AppointmentScore:
     """Scored appointment with reasoning"""
 
@@ -22,6 +26,134 @@ class AppointmentScore:
     specialist_match_score: float
     availability_score: float
     reasoning: List[str]
+    slot: AppointmentSlot
+
+
+# Alternative care options and the triage levels each one is recommended for
+CARE_OPTIONS = [
+    (
+        {
+            "name": "Emergency Room",
+            "cost_range": "$1,500 - $3,000",
+            "availability": "24/7",
+            "best_for": "Life-threatening emergencies",
+        },
+        [TriageLevel.EMERGENCY_AMBULANCE.value, TriageLevel.EMERGENCY.value],
+    ),
+    (
+        {
+            "name": "Urgent Care",
+            "cost_range": "$150 - $300",
+            "availability": "Walk-in, 8am-8pm",
+            "best_for": "Non-life-threatening urgent issues",
+        },
+        [TriageLevel.CONSULTATION_24.value, TriageLevel.EMERGENCY.value],
+    ),
+    (
+        {
+            "name": "Telemedicine",
+            "cost_range": "$40 - $90",
+            "availability": "2-4 hours",
+            "best_for": "Non-urgent consultations",
+        },
+        [TriageLevel.CONSULTATION.value, TriageLevel.SELF_CARE.value],
+    ),
+]
+
+
+def _build_alternatives(triage_level: str) -> List[Dict]:
+    """Alternative care options with the recommended flag set for a triage level"""
+    return [
+        {**option, "recommended": triage_level in recommended_for}
+        for option, recommended_for in CARE_OPTIONS
+    ]
+
+
+# The options only depend on the triage level, so build each list once
+ALTERNATIVES_BY_TRIAGE = {
+    level.value: _build_alternatives(level.value) for level in TriageLevel
+}
+NO_RECOMMENDED_ALTERNATIVES = _build_alternatives("")
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Timing score tables as (thresholds in seconds until the slot, scores):
+# a slot earlier than thresholds[i] (and no earlier threshold) scores
+# scores[i], and one past every threshold gets the last score. "Within N
+# days" means fewer than N + 1 whole days, hence the (N + 1) * DAY bounds.
+URGENCY_THRESHOLDS = {
+    # Emergency ambulance: immediate care needed
+    TriageLevel.EMERGENCY_AMBULANCE.value: ([HOUR, DAY, 3 * DAY], [1.0, 0.7, 0.3, 0.1]),
+    # Emergency: within 24 hours
+    TriageLevel.EMERGENCY.value: ([DAY, 2 * DAY, 8 * DAY], [1.0, 0.7, 0.4, 0.2]),
+    # Consultation within 24 hours
+    TriageLevel.CONSULTATION_24.value: ([DAY, 2 * DAY, 8 * DAY], [1.0, 0.8, 0.5, 0.3]),
+    # Consultation: within a week is good
+    TriageLevel.CONSULTATION.value: ([8 * DAY, 15 * DAY], [1.0, 0.8, 0.6]),
+    # Self-care: timing flexible
+    TriageLevel.SELF_CARE.value: ([31 * DAY], [1.0, 0.8]),
+}
+
+# For emergencies, sooner is critical
+EMERGENCY_AVAILABILITY_THRESHOLDS = ([2 * HOUR, 6 * HOUR, DAY], [1.0, 0.8, 0.5, 0.2])
+
+
+def _threshold_scorer(
+    thresholds: List[float], scores: List[float]
+) -> Callable[[float], float]:
+    """Scorer mapping seconds until a slot to its score in a threshold table"""
+
+    def score(seconds_until: float) -> float:
+        return scores[bisect_right(thresholds, seconds_until)]
+
+    return score
+
+
+def _routine_availability(seconds_until: float) -> float:
+    """For routine care, sooner is nice but not critical"""
+    max_seconds = 14 * DAY  # 14 days
+    normalized = 1.0 - (seconds_until / max_seconds)
+    return max(0.7, min(1.0, normalized))
+
+
+# The triage level is fixed for a whole match, so each level's timing
+# scorers are resolved once per call rather than re-dispatched per slot
+URGENCY_SCORERS = {
+    level: _threshold_scorer(*table) for level, table in URGENCY_THRESHOLDS.items()
+}
+_emergency_availability = _threshold_scorer(*EMERGENCY_AVAILABILITY_THRESHOLDS)
+
+
+@lru_cache(maxsize=128)
+def specialist_match_score(
+    recommended_specialist: str, provider_specialty: str
+) -> float:
+    """
+    Score how well provider specialty matches recommendation
+
+    Depends only on the two names, which come from a small fixed set, so the
+    result is memoized rather than lower-casing both strings for every slot
+
+    Returns: 0.0 to 1.0 (1.0 = perfect match)
+    """
+    recommended_lower = recommended_specialist.lower()
+    provider_lower = provider_specialty.lower()
+
+    # Exact match
+    if recommended_lower == provider_lower:
+        return 1.0
+
+    # Partial match (e.g., "cardiologist" in "cardiology")
+    if recommended_lower in provider_lower or provider_lower in recommended_lower:
+        return 0.8
+
+    # Primary care can handle general cases
+    if provider_lower == "primary care":
+        return 0.7
+
+    # No match
+    return 0.3
 
 
 class AppointmentMatcher:
@@ -50,34 +182,54 @@ class AppointmentMatcher:
         Args:
             triage_level: Urgency level (e.g., "emergency", "consultation")
             specialist_name: Recommended specialist
-            available_slots: Available appointment slots
+            available_slots: Slots to rank (booked ones are skipped)
             max_results: Maximum recommendations to return
 
         Returns:
             List of scored appointments, ranked best to worst
         """
-        scored_appointments = []
-
-        for slot in available_slots:
-            if not slot.available:
-                continue
-
-            # Score this appointment
-            score = self._score_appointment(triage_level, specialist_name, slot)
-            scored_appointments.append(score)
+        # One reference time so every slot is scored against the same "now",
+        # as epoch seconds to match the slots' precomputed timestamps
+        now = epoch_seconds(datetime.now())
+
+        urgency_scorer = self._urgency_scorer(triage_level)
+        availability_scorer = self._availability_scorer(triage_level)
+
+        # Score every bookable slot as plain numbers; only the winners become
+        # AppointmentScore objects with reasoning
+        scored_slots = [
+            (
+                self._score_slot(
+                    urgency_scorer, availability_scorer, specialist_name, slot, now
+                ),
+                slot,
+            )
+            for slot in available_slots
+            if slot.available
+        ]
 
-        # Sort by total score (highest first)
-        scored_appointments.sort(key=lambda x: x.total_score, reverse=True)
+        # Keep only the best max_results (highest first) without sorting them all
+        top_slots = heapq.nlargest(max_results, scored_slots, key=lambda x: x[0][0])
 
-        return scored_appointments[:max_results]
+        return [
+            self._score_appointment(triage_level, specialist_name, slot, scores, now)
+            for scores, slot in top_slots
+        ]
 
-    def _score_appointment(
-        self, triage_level: str, specialist_name: str, slot: AppointmentSlot
-    ) -> AppointmentScore:
-        """Score a single appointment"""
+    def _score_slot(
+        self,
+        urgency_scorer: Callable[[float], float],
+        availability_scorer: Callable[[float], float],
+        specialist_name: str,
+        slot: AppointmentSlot,
+        now: float,
+    ) -> Tuple[float, float, float, float]:
+        """Score a single slot as (total, urgency, specialist, availability)"""
+        # Both timing scores work off the same offset, so compute it once
+        seconds_until = slot.epoch_sec - now
 
         # 1. Urgency Match Score
-        urgency_score = self._calculate_urgency_match(triage_level, slot.datetime)
+        urgency_score = urgency_scorer(seconds_until)
 
         # 2. Specialist Match Score
         specialist_score = self._calculate_specialist_match(
@@ -85,9 +237,7 @@ class AppointmentMatcher:
         )
 
         # 3. Availability Score
-        availability_score = self._calculate_availability_score(
-            triage_level, slot.datetime
-        )
+        availability_score = availability_scorer(seconds_until)
 
         # Calculate weighted total
         total_score = (
@@ -96,7 +246,19 @@ class AppointmentMatcher:
             + availability_score * self.weights["availability"]
         )
 
-        # Generate reasoning
+        return total_score, urgency_score, specialist_score, availability_score
+
+    def _score_appointment(
+        self,
+        triage_level: str,
+        specialist_name: str,
+        slot: AppointmentSlot,
+        scores: Tuple[float, float, float, float],
+        now: float,
+    ) -> AppointmentScore:
+        """Build the scored appointment, with reasoning, for a ranked slot"""
+        total_score, urgency_score, specialist_score, availability_score = scores
+
         reasoning = self._generate_reasoning(
             triage_level,
             specialist_name,
@@ -104,6 +266,7 @@ class AppointmentMatcher:
             urgency_score,
             specialist_score,
             availability_score,
+            now,
         )
 
         return AppointmentScore(
@@ -116,120 +279,35 @@ class AppointmentMatcher:
             specialist_match_score=specialist_score,
             availability_score=availability_score,
             reasoning=reasoning,
+            slot=slot,
         )
 
-    def _calculate_urgency_match(
-        self, triage_level: str, slot_datetime: datetime
-    ) -> float:
+    def _urgency_scorer(self, triage_level: str) -> Callable[[float], float]:
         """
-        Score how well appointment timing matches urgency
+        Scorer for how well appointment timing matches urgency
 
-        Returns: 0.0 to 1.0 (1.0 = perfect match)
+        Scorers return 0.0 to 1.0 (1.0 = perfect match)
         """
-        days_until = (slot_datetime - datetime.now()).days
-        hours_until = (slot_datetime - datetime.now()).total_seconds() / 3600
-
-        # Emergency ambulance: immediate care needed
-        if triage_level == "emergency_ambulance":
-            if hours_until < 1:
-                return 1.0
-            elif days_until == 0:
-                return 0.7
-            elif days_until <= 2:
-                return 0.3
-            else:
-                return 0.1
-
-        # Emergency: within 24 hours
-        elif triage_level == "emergency":
-            if hours_until < 24:
-                return 1.0
-            elif hours_until < 48:
-                return 0.7
-            elif days_until <= 7:
-                return 0.4
-            else:
-                return 0.2
-
-        # Consultation within 24 hours
-        elif triage_level == "consultation_24":
-            if hours_until < 24:
-                return 1.0
-            elif hours_until < 48:
-                return 0.8
-            elif days_until <= 7:
-                return 0.5
-            else:
-                return 0.3
-
-        # Consultation: within a week is good
-        elif triage_level == "consultation":
-            if days_until <= 7:
-                return 1.0
-            elif days_until <= 14:
-                return 0.8
-            else:
-                return 0.6
-
-        # Self-care: timing flexible
-        else:  # self_care
-            if days_until <= 30:
-                return 1.0
-            else:
-                return 0.8
+        # Unknown levels are treated like self-care
+        return URGENCY_SCORERS.get(
+            triage_level, URGENCY_SCORERS[TriageLevel.SELF_CARE.value]
+        )
 
     def _calculate_specialist_match(
         self, recommended_specialist: str, provider_specialty: str
     ) -> float:
-        """
-        Score how well provider specialty matches recommendation
+        """Score how well provider specialty matches recommendation"""
+        return specialist_match_score(recommended_specialist, provider_specialty)
 
-        Returns: 0.0 to 1.0 (1.0 = perfect match)
+    def _availability_scorer(self, triage_level: str) -> Callable[[float], float]:
         """
-        recommended_lower = recommended_specialist.lower()
-        provider_lower = provider_specialty.lower()
+        Scorer for availability (sooner is better for urgent cases)
 
-        # Exact match
-        if recommended_lower == provider_lower:
-            return 1.0
-
-        # Partial match (e.g., "cardiologist" in "cardiology")
-        if recommended_lower in provider_lower or provider_lower in recommended_lower:
-            return 0.8
-
-        # Primary care can handle general cases
-        if provider_lower == "primary care":
-            return 0.7
-
-        # No match
-        return 0.3
-
-    def _calculate_availability_score(
-        self, triage_level: str, slot_datetime: datetime
-    ) -> float:
-        """
-        Score availability (sooner is better for urgent cases)
-
-        Returns: 0.0 to 1.0 (1.0 = best availability)
+        Scorers return 0.0 to 1.0 (1.0 = best availability)
         """
-        hours_until = (slot_datetime - datetime.now()).total_seconds() / 3600
-
-        # For emergencies, sooner is critical
         if triage_level in ["emergency_ambulance", "emergency"]:
-            if hours_until < 2:
-                return 1.0
-            elif hours_until < 6:
-                return 0.8
-            elif hours_until < 24:
-                return 0.5
-            else:
-                return 0.2
-
-        # For routine care, sooner is nice but not critical
-        else:
-            max_hours = 14 * 24  # 14 days
-            normalized = 1.0 - (hours_until / max_hours)
-            return max(0.7, min(1.0, normalized))
+            return _emergency_availability
+        return _routine_availability
 
     def _generate_reasoning(
         self,
@@ -239,13 +317,15 @@ class AppointmentMatcher:
         urgency_score: float,
         specialist_score: float,
         availability_score: float,
+        now: float,
     ) -> List[str]:
         """Generate human-readable reasoning"""
         reasons = []
 
         # Urgency reasoning
-        hours_until = (slot.datetime - datetime.now()).total_seconds() / 3600
-        days_until = (slot.datetime - datetime.now()).days
+        seconds_until = slot.epoch_sec - now
+        hours_until = seconds_until / HOUR
+        days_until = int(seconds_until // DAY)
 
         if triage_level in ["emergency_ambulance", "emergency"]:
             if hours_until < 24:
@@ -262,42 +342,18 @@ class AppointmentMatcher:
         if specialist_score >= 0.8:
             reasons.append(f"✓ Matches recommended specialist ({specialist_name})")
         elif specialist_score >= 0.7:
-            reasons.append(f"✓ Primary care provider (can handle general cases)")
+            reasons.append("✓ Primary care provider (can handle general cases)")
         else:
-            reasons.append(f"⚠ Different specialty than recommended")
+            reasons.append("⚠ Different specialty than recommended")
 
         # Availability reasoning
         if availability_score >= 0.9:
-            reasons.append(f"✓ Excellent availability")
+            reasons.append("✓ Excellent availability")
         elif availability_score >= 0.7:
-            reasons.append(f"✓ Good availability")
+            reasons.append("✓ Good availability")
 
         return reasons
 
     def get_alternative_options(self, triage_level: str) -> List[Dict]:
-        """Get alternative care options with costs"""
-        alternatives = [
-            {
-                "name": "Emergency Room",
-                "cost_range": "$1,500 - $3,000",
-                "availability": "24/7",
-                "best_for": "Life-threatening emergencies",
-                "recommended": triage_level in ["emergency_ambulance", "emergency"],
-            },
-            {
-                "name": "Urgent Care",
-                "cost_range": "$150 - $300",
-                "availability": "Walk-in, 8am-8pm",
-                "best_for": "Non-life-threatening urgent issues",
-                "recommended": triage_level in ["consultation_24", "emergency"],
-            },
-            {
-                "name": "Telemedicine",
-                "cost_range": "$40 - $90",
-                "availability": "2-4 hours",
-                "best_for": "Non-urgent consultations",
-                "recommended": triage_level in ["consultation", "self_care"],
-            },
-        ]
-
-        return alternatives
+        """Get alternative care options with costs (shared lists, do not mutate)"""
+        return ALTERNATIVES_BY_TRIAGE.get(triage_level, NO_RECOMMENDED_ALTERNATIVES)
@@ -3,10 +3,15 @@ Appointment Optimization Flow
 Complete pipeline: Symptoms → Triage → Specialist → Appointment Matching
 """
 
-from typing import Dict, List
-from dataclasses import dataclass
+import threading
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, replace
 from infermedica_client import (
     InfermedicaClient,
+    normalize_symptom_text,
+    SAFE_DEFAULT_SPECIALIST,
     ParsedSymptom,
     TriageResult,
     SpecialistRecommendation,
@@ -15,7 +20,32 @@ from appointment_simulator import AppointmentSimulator, SpecialtyType
 from appointment_matcher import AppointmentMatcher, AppointmentScore
 
 
-@dataclass
+# Infermedica results reused for repeated queries: (max entries, seconds to keep)
+ASSESSMENT_CACHE = (128, 30 * 60)
+
+# Infermedica specialist names (lower-case) -> simulator specialty
+SPECIALIST_TO_SPECIALTY = {
+    "general practitioner": SpecialtyType.PRIMARY_CARE,
+    "primary care": SpecialtyType.PRIMARY_CARE,
+    "cardiologist": SpecialtyType.CARDIOLOGY,
+    "cardiology": SpecialtyType.CARDIOLOGY,
+    "dermatologist": SpecialtyType.DERMATOLOGY,
+    "orthopedist": SpecialtyType.ORTHOPEDICS,
+    "orthopedics": SpecialtyType.ORTHOPEDICS,
+    "neurologist": SpecialtyType.NEUROLOGY,
+    "psychiatrist": SpecialtyType.PSYCHIATRY,
+    "pediatrician": SpecialtyType.PEDIATRICS,
+}
+
+
+def map_specialist_to_specialty(specialist_name: str) -> SpecialtyType:
+    """Map specialist name to our specialty enum (primary care if unknown)"""
+    return SPECIALIST_TO_SPECIALTY.get(
+        specialist_name.lower(), SpecialtyType.PRIMARY_CARE
+    )
+
+
+@dataclass(slots=True)
 class PatientInfo:
     """Patient demographic information"""
 
@@ -24,7 +54,12 @@ class PatientInfo:
     symptom_text: str
 
 
-@dataclass
+def assessment_key(patient: PatientInfo) -> Tuple[str, int, str]:
+    """Key under which a patient's triage assessment is reused"""
+    return (normalize_symptom_text(patient.symptom_text), patient.age, patient.sex)
+
+
+@dataclass(slots=True)
 class OptimizationResult:
     """Complete result with triage + specialist + appointments"""
 
@@ -36,17 +71,39 @@ class OptimizationResult:
     alternative_options: List[Dict]
 
 
+def _copy_assessment(
+    assessment: Tuple[List[ParsedSymptom], TriageResult, SpecialistRecommendation],
+) -> Tuple[List[ParsedSymptom], TriageResult, SpecialistRecommendation]:
+    """Copy a cached assessment so sessions and batch threads never share it"""
+    symptoms, triage, specialist = assessment
+    return (
+        [replace(symptom) for symptom in symptoms],
+        replace(triage, serious_observations=list(triage.serious_observations)),
+        replace(specialist),
+    )
+
+
 class AppointmentOptimizer:
     """
     Main orchestrator for appointment optimization
     Calls /triage and /recommend_specialist separately
     """
 
-    def __init__(self):
-        self.infermedica = InfermedicaClient()
+    def __init__(
+        self,
+        client: Optional[InfermedicaClient] = None,
+        cache_assessments: bool = True,
+    ):
+        self.infermedica = client or InfermedicaClient()
         self.simulator = AppointmentSimulator()
         self.matcher = AppointmentMatcher()
 
+        # Parsed symptoms + triage + specialist per query; the optimizer is
+        # shared across sessions and batch threads, so access is locked
+        self.cache_assessments = cache_assessments
+        self._assessment_cache = TTLCache(*ASSESSMENT_CACHE)
+        self._assessment_lock = threading.Lock()
+
     def optimize(self, patient: PatientInfo) -> OptimizationResult:
         """
         Complete optimization flow
@@ -61,47 +118,24 @@ class AppointmentOptimizer:
         print("🔍 Starting Appointment Optimization")
         print("=" * 60)
 
-        # Step 1: Parse symptoms
-        print(f"\n1️⃣ Parsing symptoms: '{patient.symptom_text}'")
-        symptoms = self.infermedica.parse_symptoms(
-            text=patient.symptom_text, age=patient.age, sex=patient.sex
-        )
-
-        print(f"   ✓ Found {len(symptoms)} symptoms:")
-        for symptom in symptoms:
-            print(f"     • {symptom.common_name}")
-
-        # Step 2: Run triage (urgency level)
-        print(f"\n2️⃣ Running clinical triage...")
-        triage = self.infermedica.run_triage(
-            symptoms=symptoms, age=patient.age, sex=patient.sex
-        )
-
-        print(f"   ✓ Urgency: {triage.triage_level.value}")
-        print(f"   ✓ Channel: {triage.recommended_channel}")
-
-        # Step 3: Get specialist recommendation (separate call)
-        print(f"\n3️⃣ Getting specialist recommendation...")
-        specialist = self.infermedica.recommend_specialist(
-            symptoms=symptoms, age=patient.age, sex=patient.sex
-        )
-
-        print(f"   ✓ Specialist: {specialist.specialist_name}")
-        print(f"   ✓ Category: {specialist.specialist_category}")
+        # Steps 1-3: Parse, triage and specialist (reused for repeat queries)
+        symptoms, triage, specialist = self._assess(patient)
 
         # Step 4: Generate appointment slots
         print(f"\n4️⃣ Finding available appointments...")
 
         # Map specialist to our specialty types
-        specialty = self._map_specialist_to_specialty(specialist.specialist_name)
+        specialty = map_specialist_to_specialty(specialist.specialist_name)
 
         # Get slots (filter by specialty if urgent)
         if triage.triage_level.value in ["emergency", "emergency_ambulance"]:
             slots = self.simulator.get_urgent_slots(specialty)
         else:
-            slots = self.simulator.generate_slots(specialty=specialty, days_ahead=14)
+            slots = self.simulator.generate_slots(
+                specialty=specialty, days_ahead=14, available_only=True
+            )
 
-        print(f"   ✓ Found {len([s for s in slots if s.available])} available slots")
+        print(f"   ✓ Found {len(slots)} available slots")
 
         # Step 5: Match appointments
         print(f"\n5️⃣ Matching optimal appointments...")
@@ -131,23 +165,98 @@ class AppointmentOptimizer:
             alternative_options=alternatives,
         )
 
-    def _map_specialist_to_specialty(self, specialist_name: str) -> SpecialtyType:
-        """Map specialist name to our specialty enum"""
-        mapping = {
-            "general practitioner": SpecialtyType.PRIMARY_CARE,
-            "primary care": SpecialtyType.PRIMARY_CARE,
-            "cardiologist": SpecialtyType.CARDIOLOGY,
-            "cardiology": SpecialtyType.CARDIOLOGY,
-            "dermatologist": SpecialtyType.DERMATOLOGY,
-            "orthopedist": SpecialtyType.ORTHOPEDICS,
-            "orthopedics": SpecialtyType.ORTHOPEDICS,
-            "neurologist": SpecialtyType.NEUROLOGY,
-            "psychiatrist": SpecialtyType.PSYCHIATRY,
-            "pediatrician": SpecialtyType.PEDIATRICS,
-        }
-
-        specialist_lower = specialist_name.lower()
-        return mapping.get(specialist_lower, SpecialtyType.PRIMARY_CARE)
+    def _assess(
+        self, patient: PatientInfo
+    ) -> Tuple[List[ParsedSymptom], TriageResult, SpecialistRecommendation]:
+        """Run steps 1-3, memoized on the normalized (text, age, sex) query"""
+        key = assessment_key(patient)
+
+        if self.cache_assessments:
+            with self._assessment_lock:
+                cached = self._assessment_cache.get(key)
+            if cached is not None:
+                print("\n♻️ Reusing assessment for a repeated query")
+                return _copy_assessment(cached)
+
+        # Step 1: Parse symptoms
+        print(f"\n1️⃣ Parsing symptoms: '{patient.symptom_text}'")
+        symptoms = self.infermedica.parse_symptoms(
+            text=patient.symptom_text, age=patient.age, sex=patient.sex
+        )
+
+        print(f"   ✓ Found {len(symptoms)} symptoms:")
+        for symptom in symptoms:
+            print(f"     • {symptom.common_name}")
+
+        # Steps 2 + 3: Triage and specialist only depend on the parsed
+        # symptoms, so issue both calls concurrently
+        print(f"\n2️⃣ Running clinical triage...")
+        print(f"3️⃣ Getting specialist recommendation...")
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            triage_future = pool.submit(
+                self.infermedica.run_triage,
+                symptoms=symptoms,
+                age=patient.age,
+                sex=patient.sex,
+            )
+            specialist_future = pool.submit(
+                self.infermedica.recommend_specialist,
+                symptoms=symptoms,
+                age=patient.age,
+                sex=patient.sex,
+            )
+            triage = triage_future.result()
+            specialist = specialist_future.result()
+
+        print(f"   ✓ Urgency: {triage.triage_level.value}")
+        print(f"   ✓ Channel: {triage.recommended_channel}")
+        print(f"   ✓ Specialist: {specialist.specialist_name}")
+        print(f"   ✓ Category: {specialist.specialist_category}")
+
+        # Nothing parsed or the fallback specialist means an API call failed,
+        # so don't keep it
+        assessment = (symptoms, triage, specialist)
+        if (
+            self.cache_assessments
+            and symptoms
+            and specialist is not SAFE_DEFAULT_SPECIALIST
+        ):
+            with self._assessment_lock:
+                self._assessment_cache[key] = _copy_assessment(assessment)
+
+        return assessment
+
+    def optimize_batch(
+        self, patients: List[PatientInfo], max_workers: int = 4
+    ) -> List[OptimizationResult]:
+        """
+        Optimize several patients concurrently
+
+        Each run is dominated by Infermedica round-trips, so the runs overlap
+        on a thread pool; patients whose query only differs in the case or
+        spacing of the symptom text share a single run.
+
+        Args:
+            patients: Patients to optimize
+            max_workers: Maximum number of concurrent runs
+
+        Returns:
+            One result per patient, in input order
+        """
+        unique_patients = {}
+        for patient in patients:
+            unique_patients.setdefault(assessment_key(patient), patient)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = dict(
+                zip(unique_patients, pool.map(self.optimize, unique_patients.values()))
+            )
+
+        # Each result still reports the patient it was requested for
+        return [
+            replace(results[assessment_key(patient)], patient=patient)
+            for patient in patients
+        ]
 
 
 def main():
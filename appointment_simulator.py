@@ -4,12 +4,24 @@ Generates realistic provider schedules and availability for demo purposes
 """
 
 import random
-from datetime import datetime, timedelta
-from typing import List, Dict
-from dataclasses import dataclass
+import threading
+from operator import attrgetter
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
 
+# Slot times are naive local datetimes; measuring them from a naive epoch
+# keeps second offsets identical to plain datetime subtraction
+EPOCH = datetime(1970, 1, 1)
+
+
+def epoch_seconds(moment: datetime) -> float:
+    """Seconds between the naive epoch and ``moment``"""
+    return (moment - EPOCH).total_seconds()
+
+
 class SpecialtyType(Enum):
     """Medical specialties"""
 
@@ -40,7 +52,40 @@ class TimeSlot(Enum):
     EVENING = "Evening (5:00 PM - 8:00 PM)"
 
 
-@dataclass
+# Lookup tables used for every generated slot, built once at import
+TIME_SLOTS = tuple(TimeSlot)
+APPOINTMENT_TYPES = tuple(AppointmentType)
+SLOT_MINUTES = (0, 15, 30, 45)
+
+# Hour range (start, end) for each time slot
+HOUR_RANGES = {
+    TimeSlot.MORNING: (8, 12),
+    TimeSlot.AFTERNOON: (12, 17),
+    TimeSlot.EVENING: (17, 20),
+}
+
+# (duration in minutes, base cost) for each appointment type
+DURATION_COST = {
+    AppointmentType.NEW_PATIENT: (60, 250),
+    AppointmentType.FOLLOW_UP: (30, 150),
+    AppointmentType.URGENT: (20, 200),
+    AppointmentType.ANNUAL_PHYSICAL: (45, 200),
+    AppointmentType.PROCEDURE: (90, 500),
+}
+
+# Cost multiplier for each specialty
+SPECIALTY_COST_MULTIPLIERS = {
+    SpecialtyType.PRIMARY_CARE: 1.0,
+    SpecialtyType.CARDIOLOGY: 1.5,
+    SpecialtyType.DERMATOLOGY: 1.2,
+    SpecialtyType.ORTHOPEDICS: 1.4,
+    SpecialtyType.NEUROLOGY: 1.6,
+    SpecialtyType.PSYCHIATRY: 1.3,
+    SpecialtyType.PEDIATRICS: 0.9,
+}
+
+
+@dataclass(slots=True)
 class Provider:
     """Healthcare provider"""
 
@@ -53,7 +98,7 @@ class Provider:
     years_experience: int = 10
 
 
-@dataclass
+@dataclass(slots=True)
 class AppointmentSlot:
     """Available appointment slot"""
 
@@ -64,103 +109,126 @@ class AppointmentSlot:
     duration_minutes: int
     cost_estimate: int
     available: bool = True
+    epoch_sec: int = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # Scoring works off integer offsets rather than timedelta objects
+        self.epoch_sec = int(epoch_seconds(self.datetime))
+
+
+# Sample providers, shared by every simulator instance
+PROVIDERS = (
+    # Primary Care
+    Provider(
+        "prov_001",
+        "Dr. Emily Rodriguez",
+        SpecialtyType.PRIMARY_CARE,
+        "Main Campus - Building A",
+        True,
+        4.8,
+        15,
+    ),
+    Provider(
+        "prov_002",
+        "Dr. Michael Chen",
+        SpecialtyType.PRIMARY_CARE,
+        "North Clinic",
+        True,
+        4.6,
+        8,
+    ),
+    # Cardiology
+    Provider(
+        "prov_003",
+        "Dr. Sarah Chen",
+        SpecialtyType.CARDIOLOGY,
+        "Main Campus Cardiology",
+        True,
+        4.9,
+        20,
+    ),
+    Provider(
+        "prov_004",
+        "Dr. James Wilson",
+        SpecialtyType.CARDIOLOGY,
+        "Heart Center",
+        True,
+        4.7,
+        12,
+    ),
+    # Dermatology
+    Provider(
+        "prov_005",
+        "Dr. Lisa Anderson",
+        SpecialtyType.DERMATOLOGY,
+        "Dermatology Clinic",
+        True,
+        4.8,
+        18,
+    ),
+    # Orthopedics
+    Provider(
+        "prov_006",
+        "Dr. Robert Martinez",
+        SpecialtyType.ORTHOPEDICS,
+        "Sports Medicine Center",
+        True,
+        4.7,
+        15,
+    ),
+    # Neurology
+    Provider(
+        "prov_007",
+        "Dr. Patricia Kumar",
+        SpecialtyType.NEUROLOGY,
+        "Neurology Center",
+        True,
+        4.9,
+        22,
+    ),
+    # Psychiatry
+    Provider(
+        "prov_008",
+        "Dr. David Thompson",
+        SpecialtyType.PSYCHIATRY,
+        "Behavioral Health",
+        True,
+        4.6,
+        10,
+    ),
+)
+
+# Providers per specialty, so filtering by specialty is a dict lookup
+PROVIDERS_BY_SPECIALTY = {
+    specialty: tuple(p for p in PROVIDERS if p.specialty == specialty)
+    for specialty in SpecialtyType
+}
 
 
 class AppointmentSimulator:
     """Simulates realistic appointment availability"""
 
-    def __init__(self):
-        self.providers = self._generate_providers()
-
-    def _generate_providers(self) -> List[Provider]:
-        """Generate sample providers"""
-        providers = [
-            # Primary Care
-            Provider(
-                "prov_001",
-                "Dr. Emily Rodriguez",
-                SpecialtyType.PRIMARY_CARE,
-                "Main Campus - Building A",
-                True,
-                4.8,
-                15,
-            ),
-            Provider(
-                "prov_002",
-                "Dr. Michael Chen",
-                SpecialtyType.PRIMARY_CARE,
-                "North Clinic",
-                True,
-                4.6,
-                8,
-            ),
-            # Cardiology
-            Provider(
-                "prov_003",
-                "Dr. Sarah Chen",
-                SpecialtyType.CARDIOLOGY,
-                "Main Campus Cardiology",
-                True,
-                4.9,
-                20,
-            ),
-            Provider(
-                "prov_004",
-                "Dr. James Wilson",
-                SpecialtyType.CARDIOLOGY,
-                "Heart Center",
-                True,
-                4.7,
-                12,
-            ),
-            # Dermatology
-            Provider(
-                "prov_005",
-                "Dr. Lisa Anderson",
-                SpecialtyType.DERMATOLOGY,
-                "Dermatology Clinic",
-                True,
-                4.8,
-                18,
-            ),
-            # Orthopedics
-            Provider(
-                "prov_006",
-                "Dr. Robert Martinez",
-                SpecialtyType.ORTHOPEDICS,
-                "Sports Medicine Center",
-                True,
-                4.7,
-                15,
-            ),
-            # Neurology
-            Provider(
-                "prov_007",
-                "Dr. Patricia Kumar",
-                SpecialtyType.NEUROLOGY,
-                "Neurology Center",
-                True,
-                4.9,
-                22,
-            ),
-            # Psychiatry
-            Provider(
-                "prov_008",
-                "Dr. David Thompson",
-                SpecialtyType.PSYCHIATRY,
-                "Behavioral Health",
-                True,
-                4.6,
-                10,
-            ),
-        ]
-        return providers
+    def __init__(self, cache_slots: bool = True, seed: Optional[int] = None):
+        self.providers = PROVIDERS
+
+        # Own generator, so a seed makes demo schedules reproducible without
+        # touching the global random state
+        self._rng = random.Random(seed)
+
+        # Generated schedules per query, kept for the day they were built on
+        self.cache_slots = cache_slots
+        self._slot_cache: Dict[Tuple, List[AppointmentSlot]] = {}
+        self._slot_cache_day: Optional[date] = None
+
+        # The simulator is shared across sessions and batch threads
+        self._slot_cache_lock = threading.Lock()
 
     def generate_slots(
         self,
         specialty: SpecialtyType = None,
         days_ahead: int = 14,
         appointment_type: AppointmentType = None,
+        available_only: bool = False,
     ) -> List[AppointmentSlot]:
         """
         Generate appointment slots
@@ -169,92 +237,114 @@ class AppointmentSimulator:
             specialty: Filter by specialty
             days_ahead: Number of days to generate slots for
             appointment_type: Filter by appointment type
+            available_only: Drop already-booked slots
 
         Returns:
             List of available appointment slots
         """
+        now = datetime.now()
+        if not self.cache_slots:
+            return self._generate_slots(
+                specialty, days_ahead, appointment_type, available_only, now
+            )
+
+        # A schedule stays the same for the rest of the day, so repeat
+        # queries reuse it instead of re-rolling every slot
+        key = (specialty, days_ahead, appointment_type, available_only)
+        with self._slot_cache_lock:
+            if self._slot_cache_day != now.date():
+                self._slot_cache.clear()
+                self._slot_cache_day = now.date()
+
+            slots = self._slot_cache.get(key)
+            if slots is None:
+                slots = self._slot_cache[key] = self._generate_slots(
+                    specialty, days_ahead, appointment_type, available_only, now
+                )
+
+        # Hand out a copy so callers can't reorder or trim the cached list
+        return list(slots)
+
+    def clear_slot_cache(self):
+        """Forget generated schedules so the next queries re-roll them"""
+        with self._slot_cache_lock:
+            self._slot_cache.clear()
+            self._slot_cache_day = None
+
+    def _generate_slots(
+        self,
+        specialty: Optional[SpecialtyType],
+        days_ahead: int,
+        appointment_type: Optional[AppointmentType],
+        available_only: bool,
+        now: datetime,
+    ) -> List[AppointmentSlot]:
+        """Generate a fresh schedule (see generate_slots)"""
         slots = []
 
         # Filter providers by specialty if specified
         providers = self.providers
         if specialty:
-            providers = [p for p in providers if p.specialty == specialty]
+            providers = PROVIDERS_BY_SPECIALTY[specialty]
+
+        # Every provider shares the same calendar of weekdays (simple
+        # weekend logic), so build it once
+        days = [now + timedelta(days=day_offset) for day_offset in range(days_ahead)]
+        days = [(day, day.strftime("%Y%m%d")) for day in days if day.weekday() < 5]
 
         for provider in providers:
             # Generate slots for each day
-            for day_offset in range(days_ahead):
-                date = datetime.now() + timedelta(days=day_offset)
-
-                # Skip weekends (simple logic)
-                if date.weekday() >= 5:
-                    continue
-
+            for day, date_key in days:
                 # Generate 2-4 slots per day per provider
-                num_slots = random.randint(2, 4)
+                num_slots = self._rng.randint(2, 4)
 
                 for _ in range(num_slots):
-                    slot = self._generate_slot(provider, date, appointment_type)
-                    if slot:
-                        slots.append(slot)
-
-        return sorted(slots, key=lambda x: x.datetime)
+                    # 80% of slots are available (simulate some bookings);
+                    # decide first so booked slots are never built when
+                    # they would be dropped anyway
+                    available = self._rng.random() < 0.8
+                    if available or not available_only:
+                        slots.append(
+                            self._generate_slot(
+                                provider, day, date_key, available, appointment_type
+                            )
+                        )
+
+        # Integer keys compare faster than datetimes and give the same order
+        slots.sort(key=attrgetter("epoch_sec"))
+        return slots
 
     def _generate_slot(
         self,
         provider: Provider,
-        date: datetime,
+        day: datetime,
+        date_key: str,
+        available: bool,
         appointment_type: AppointmentType = None,
     ) -> AppointmentSlot:
-        """Generate a single appointment slot"""
+        """Generate a single appointment slot (date_key is day as YYYYMMDD)"""
 
         # Random time slot
-        time_slot = random.choice(list(TimeSlot))
+        time_slot = self._rng.choice(TIME_SLOTS)
 
         # Map time slot to hour
-        hour_ranges = {
-            TimeSlot.MORNING: (8, 12),
-            TimeSlot.AFTERNOON: (12, 17),
-            TimeSlot.EVENING: (17, 20),
-        }
+        start_hour, end_hour = HOUR_RANGES[time_slot]
+        hour = self._rng.randint(start_hour, end_hour - 1)
+        minute = self._rng.choice(SLOT_MINUTES)
 
-        start_hour, end_hour = hour_ranges[time_slot]
-        hour = random.randint(start_hour, end_hour - 1)
-        minute = random.choice([0, 15, 30, 45])
-
-        slot_datetime = date.replace(hour=hour, minute=minute, second=0)
+        slot_datetime = day.replace(hour=hour, minute=minute, second=0, microsecond=0)
 
         # Determine appointment type
         if appointment_type is None:
-            appointment_type = random.choice(list(AppointmentType))
+            appointment_type = self._rng.choice(APPOINTMENT_TYPES)
 
         # Determine duration and cost based on type
-        duration_cost = {
-            AppointmentType.NEW_PATIENT: (60, 250),
-            AppointmentType.FOLLOW_UP: (30, 150),
-            AppointmentType.URGENT: (20, 200),
-            AppointmentType.ANNUAL_PHYSICAL: (45, 200),
-            AppointmentType.PROCEDURE: (90, 500),
-        }
-
-        duration, base_cost = duration_cost[appointment_type]
+        duration, base_cost = DURATION_COST[appointment_type]
 
         # Adjust cost by specialty
-        specialty_multipliers = {
-            SpecialtyType.PRIMARY_CARE: 1.0,
-            SpecialtyType.CARDIOLOGY: 1.5,
-            SpecialtyType.DERMATOLOGY: 1.2,
-            SpecialtyType.ORTHOPEDICS: 1.4,
-            SpecialtyType.NEUROLOGY: 1.6,
-            SpecialtyType.PSYCHIATRY: 1.3,
-            SpecialtyType.PEDIATRICS: 0.9,
-        }
+        cost = int(base_cost * SPECIALTY_COST_MULTIPLIERS[provider.specialty])
 
-        cost = int(base_cost * specialty_multipliers[provider.specialty])
-
-        # 80% of slots are available (simulate some bookings)
-        available = random.random() < 0.8
-
-        slot_id = f"slot_{provider.id}_{slot_datetime.strftime('%Y%m%d%H%M')}"
+        slot_id = f"slot_{provider.id}_{date_key}{hour:02d}{minute:02d}"
 
         return AppointmentSlot(
             id=slot_id,
@@ -268,16 +358,18 @@ class AppointmentSimulator:
 
     def get_provider_by_specialty(self, specialty: SpecialtyType) -> List[Provider]:
         """Get providers by specialty"""
-        return [p for p in self.providers if p.specialty == specialty]
+        return list(PROVIDERS_BY_SPECIALTY[specialty])
 
     def get_urgent_slots(
         self, specialty: SpecialtyType = None
     ) -> List[AppointmentSlot]:
         """Get urgent care slots (within 48 hours)"""
-        slots = self.generate_slots(
-            specialty=specialty, days_ahead=2, appointment_type=AppointmentType.URGENT
+        return self.generate_slots(
+            specialty=specialty,
+            days_ahead=2,
+            appointment_type=AppointmentType.URGENT,
+            available_only=True,
         )
-        return [s for s in slots if s.available]
 
 
 def demo_simulator():
@@ -291,15 +383,14 @@ def demo_simulator():
     # Show cardiology slots
     print("\n🫀 Cardiology Appointments (Next 7 days):")
     cardio_slots = simulator.generate_slots(
-        specialty=SpecialtyType.CARDIOLOGY, days_ahead=7
+        specialty=SpecialtyType.CARDIOLOGY, days_ahead=7, available_only=True
     )
 
     for slot in cardio_slots[:5]:
-        if slot.available:
-            print(f"\n  {slot.provider.name}")
-            print(f"  📅 {slot.datetime.strftime('%A, %B %d at %I:%M %p')}")
-            print(f"  💰 ${slot.cost_estimate}")
-            print(f"  ⏱️ {slot.duration_minutes} minutes")
+        print(f"\n  {slot.provider.name}")
+        print(f"  📅 {slot.datetime.strftime('%A, %B %d at %I:%M %p')}")
+        print(f"  💰 ${slot.cost_estimate}")
+        print(f"  ⏱️ {slot.duration_minutes} minutes")
 
     # Show urgent slots
     print("\n\n🚨 Urgent Care Slots (Next 48 hours):")
@@ -3,27 +3,58 @@ Infermedica API Client
 Handles authentication, symptom parsing, triage, and specialist recommendation
 """
 
+import json
+import logging
 import os
+import socket
+import threading
 import requests
-from typing import Dict, List, Optional
+from cachetools import TTLCache
+from concurrent.futures import Future, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 from dataclasses import dataclass
-from enum import Enum
+from triage_levels import TriageLevel
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
 
-class TriageLevel(Enum):
-    """5-level triage from Infermedica"""
+# (connect, read) seconds per attempt, so a stalled connection fails and is
+# retried instead of hanging the caller
+REQUEST_TIMEOUT = (3.05, 10)
 
-    EMERGENCY_AMBULANCE = "emergency_ambulance"
-    EMERGENCY = "emergency"
-    CONSULTATION_24 = "consultation_24"
-    CONSULTATION = "consultation"
-    SELF_CARE = "self_care"
+# Successful /parse and /suggest responses are reused for identical
+# queries: (max entries, seconds to keep)
+PARSE_CACHE = (512, 5 * 60)
+SUGGEST_CACHE = (1024, 60)
 
+# /diagnosis answers for an identical evidence set, so a repeated or retried
+# interview step doesn't pay another round trip
+DIAGNOSIS_CACHE = (256, 60)
 
-@dataclass
+# Demographic risk factors only depend on age and sex, so they are shared
+# across interviews and kept much longer
+RISK_FACTOR_CACHE = (512, 60 * 60)
+
+# Send TCP keepalives on idle pooled connections so intermediaries don't
+# silently drop them while a patient is answering, forcing a new handshake
+KEEPALIVE_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+]
+if hasattr(socket, "TCP_KEEPIDLE"):  # Linux; other platforms keep OS defaults
+    KEEPALIVE_SOCKET_OPTIONS.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60))
+
+
+def normalize_symptom_text(text: str) -> str:
+    """Case- and whitespace-insensitive form of free text, for cache keys"""
+    return " ".join(text.lower().split())
+
+
+@dataclass(slots=True)
 class ParsedSymptom:
     """Symptom parsed from text"""
 
@@ -33,7 +64,7 @@ class ParsedSymptom:
     choice_id: str = "present"  # present, absent, unknown
 
 
-@dataclass
+@dataclass(slots=True)
 class TriageResult:
     """Result from /triage endpoint - urgency only"""
 
@@ -43,7 +74,7 @@ class TriageResult:
     root_cause: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SpecialistRecommendation:
     """Result from /recommend_specialist endpoint"""
 
@@ -52,7 +83,7 @@ class SpecialistRecommendation:
     specialist_category: str
 
 
-@dataclass
+@dataclass(slots=True)
 class DiagnosisQuestion:
     """Question from diagnosis endpoint (for full interview flow)"""
 
@@ -62,7 +93,7 @@ class DiagnosisQuestion:
     question_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DiagnosisResult:
     """Result from diagnosis endpoint (for full interview flow)"""
 
@@ -72,6 +103,29 @@ class DiagnosisResult:
     extras: Dict
 
 
+# Returned (shared, so don't mutate it) when no specialist can be recommended
+SAFE_DEFAULT_SPECIALIST = SpecialistRecommendation(
+    specialist_id="sp_1",
+    specialist_name="General Practitioner",
+    specialist_category="Primary Care",
+)
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections use KEEPALIVE_SOCKET_OPTIONS"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = KEEPALIVE_SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+
+def symptoms_to_evidence(symptoms: List[ParsedSymptom]) -> List[Dict]:
+    """Initial-evidence entries for parsed symptoms, as the API expects them"""
+    return [
+        {"id": s.id, "choice_id": s.choice_id, "source": "initial"} for s in symptoms
+    ]
+
+
 class InfermedicaClient:
     """
     Client for Infermedica Platform/Engine API
@@ -95,10 +149,74 @@ class InfermedicaClient:
             "Content-Type": "application/json",
         }
 
+        # One pooled keep-alive session for every endpoint call
+        self.session = self._build_session()
+
+        # The client is shared across threads, so cache access is locked
+        self._parse_cache = TTLCache(*PARSE_CACHE)
+        self._suggest_cache = TTLCache(*SUGGEST_CACHE)
+        self._risk_factor_cache = TTLCache(*RISK_FACTOR_CACHE)
+        self._diagnosis_cache = TTLCache(*DIAGNOSIS_CACHE)
+        self._cache_lock = threading.Lock()
+
+        # /suggest key -> Future of the request currently fetching it
+        self._inflight: Dict[str, Future] = {}
+
+    def _build_session(self) -> requests.Session:
+        """Create a connection-pooled session with retry/backoff on transient errors"""
+        session = requests.Session()
+        session.headers.update(self.headers)
+
+        # All Infermedica endpoints used here are side-effect free POSTs,
+        # so they are safe to retry on transient failures
+        # (429/5xx only; other 4xx are permanent and fail straight away).
+        # Jitter keeps concurrent sessions from retrying in lockstep
+        retries = Retry(
+            total=3,
+            backoff_factor=0.3,
+            backoff_max=2,
+            backoff_jitter=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"POST"}),
+        )
+        adapter = KeepAliveAdapter(
+            pool_connections=10, pool_maxsize=20, max_retries=retries
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+    def close(self):
+        """Release the pooled connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _cache_get(self, cache: TTLCache, key):
+        """Cached value for key, or None"""
+        with self._cache_lock:
+            return cache.get(key)
+
+    def _cache_put(self, cache: TTLCache, key, value):
+        """Store a successful response"""
+        with self._cache_lock:
+            cache[key] = value
+
     def parse_symptoms(
         self, text: str, age: int, sex: str, include_tokens: bool = False
     ) -> List[ParsedSymptom]:
         """Parse free text into structured symptoms"""
+        # Retyped text that only differs in case or spacing parses the same
+        key = (normalize_symptom_text(text), age, sex, include_tokens)
+        cached = self._cache_get(self._parse_cache, key)
+        if cached is not None:
+            return list(cached)
+
         url = f"{self.base_url}/parse"
 
         payload = {
@@ -109,26 +227,40 @@ class InfermedicaClient:
         }
 
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self.session.post(url, json=payload, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             data = response.json()
 
-            symptoms = []
-            for mention in data.get("mentions", []):
-                symptom = ParsedSymptom(
+            # A missing or null common_name falls back to the medical name
+            symptoms = [
+                ParsedSymptom(
                     id=mention["id"],
                     name=mention["name"],
-                    common_name=mention.get("common_name", mention["name"]),
+                    common_name=mention.get("common_name") or mention["name"],
                     choice_id="present",
                 )
-                symptoms.append(symptom)
+                for mention in data.get("mentions", [])
+            ]
 
-            return symptoms
+            self._cache_put(self._parse_cache, key, symptoms)
+            return list(symptoms)
 
-        except requests.exceptions.RequestException as e:
-            print(f"✗ Parse failed: {e}")
+        except requests.exceptions.RequestException:
+            logger.exception("Parse failed")
             raise
 
+    def parse_symptoms_batch(
+        self, queries: List[Tuple[str, int, str]], max_workers: int = 8
+    ) -> List[List[ParsedSymptom]]:
+        """
+        Parse several (text, age, sex) queries concurrently
+
+        The calls share the pooled session, so their round-trips overlap
+        instead of running back to back. Results are in input order.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(lambda query: self.parse_symptoms(*query), queries))
+
     def run_triage(
         self, symptoms: List[ParsedSymptom], age: int, sex: str
     ) -> TriageResult:
@@ -138,15 +270,14 @@ class InfermedicaClient:
         """
         url = f"{self.base_url}/triage"
 
-        evidence = [
-            {"id": s.id, "choice_id": s.choice_id, "source": "initial"}
-            for s in symptoms
-        ]
-
-        payload = {"sex": sex, "age": {"value": age}, "evidence": evidence}
+        payload = {
+            "sex": sex,
+            "age": {"value": age},
+            "evidence": symptoms_to_evidence(symptoms),
+        }
 
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self.session.post(url, json=payload, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             data = response.json()
 
@@ -157,25 +288,37 @@ class InfermedicaClient:
                 root_cause=data.get("root_cause", ""),
             )
 
-        except requests.exceptions.RequestException as e:
-            print(f"✗ Triage failed: {e}")
+        except requests.exceptions.RequestException:
+            logger.exception("Triage failed")
             raise
 
+    def parse_and_triage(
+        self, text: str, age: int, sex: str
+    ) -> Tuple[List[ParsedSymptom], TriageResult]:
+        """
+        Parse free text and triage the result in one call
+
+        Triage needs the parsed evidence, so the two requests stay in
+        sequence, but both go over the same pooled connection and a
+        repeated text reuses the cached parse.
+        """
+        symptoms = self.parse_symptoms(text, age, sex)
+        return symptoms, self.run_triage(symptoms, age, sex)
+
     def recommend_specialist(
         self, symptoms: List[ParsedSymptom], age: int, sex: str
     ) -> SpecialistRecommendation:
         """Get specialist recommendation from /recommend_specialist endpoint"""
         url = f"{self.base_url}/recommend_specialist"
 
-        evidence = [
-            {"id": s.id, "choice_id": s.choice_id, "source": "initial"}
-            for s in symptoms
-        ]
-
-        payload = {"sex": sex, "age": {"value": age}, "evidence": evidence}
+        payload = {
+            "sex": sex,
+            "age": {"value": age},
+            "evidence": symptoms_to_evidence(symptoms),
+        }
 
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self.session.post(url, json=payload, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             data = response.json()
 
@@ -187,42 +330,88 @@ class InfermedicaClient:
                 specialist_category=specialist.get("category", "Primary Care"),
             )
 
-        except requests.exceptions.RequestException as e:
-            print(f"✗ Specialist recommendation failed: {e}")
+        except requests.exceptions.RequestException:
+            logger.exception("Specialist recommendation failed")
             # Return safe default
-            return SpecialistRecommendation(
-                specialist_id="sp_1",
-                specialist_name="General Practitioner",
-                specialist_category="Primary Care",
-            )
+            return SAFE_DEFAULT_SPECIALIST
 
-    def suggest_risk_factors(
-        self, age: int, sex: str, interview_id: Optional[str] = None
+    def _suggest(
+        self,
+        suggest_method: str,
+        label: str,
+        age: int,
+        sex: str,
+        evidence: Optional[List[Dict]] = None,
+        interview_id: Optional[str] = None,
+        cache: Optional[TTLCache] = None,
     ) -> List[Dict]:
-        """Get demographic risk factors"""
-        url = f"{self.base_url}/suggest"
-
-        payload = {
-            "sex": sex,
-            "age": {"value": age},
-            "suggest_method": "demographic_risk_factors",
-        }
-
+        """POST to /suggest, reusing recent results for an identical payload"""
+        payload = {"sex": sex, "age": {"value": age}}
+        if evidence is not None:
+            payload["evidence"] = evidence
+        payload["suggest_method"] = suggest_method
+
+        # interview_id only tags the request, so it's left out of the key
+        key = json.dumps(payload, sort_keys=True)
         if interview_id:
             payload["interview_id"] = interview_id
 
+        if cache is None:
+            cache = self._suggest_cache
+
+        # Identical concurrent requests (e.g. several sessions for the same
+        # patient profile) wait for the one already in flight
+        with self._cache_lock:
+            cached = cache.get(key)
+            pending = None if cached is not None else self._inflight.get(key)
+            if cached is None and pending is None:
+                request = self._inflight[key] = Future()
+
+        if cached is not None:
+            return list(cached)
+        if pending is not None:
+            return list(pending.result())
+
+        suggestions = None
+        try:
+            suggestions = self._post_suggest(payload, label)
+        finally:
+            with self._cache_lock:
+                if suggestions is not None:
+                    cache[key] = suggestions
+                del self._inflight[key]
+            request.set_result(suggestions or [])
+
+        return list(suggestions or [])
+
+    def _post_suggest(self, payload: Dict, label: str) -> Optional[List[Dict]]:
+        """POST to /suggest, or None if the call failed"""
+        url = f"{self.base_url}/suggest"
+
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self.session.post(url, json=payload, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             data = response.json()
+        except requests.exceptions.RequestException:
+            logger.exception("%s failed", label)
+            return None
+
+        if isinstance(data, list):
+            return data
+        return data.get("suggestions", [])
 
-            if isinstance(data, list):
-                return data
-            else:
-                return data.get("suggestions", [])
-        except requests.exceptions.RequestException as e:
-            print(f"✗ Risk factors failed: {e}")
-            return []
+    def suggest_risk_factors(
+        self, age: int, sex: str, interview_id: Optional[str] = None
+    ) -> List[Dict]:
+        """Get demographic risk factors"""
+        return self._suggest(
+            "demographic_risk_factors",
+            "Risk factors",
+            age,
+            sex,
+            interview_id=interview_id,
+            cache=self._risk_factor_cache,
+        )
 
     def suggest_related_symptoms(
         self,
@@ -232,30 +421,9 @@ class InfermedicaClient:
         interview_id: Optional[str] = None,
     ) -> List[Dict]:
         """Get related symptoms to ask about"""
-        url = f"{self.base_url}/suggest"
-
-        payload = {
-            "sex": sex,
-            "age": {"value": age},
-            "evidence": evidence,
-            "suggest_method": "symptoms",
-        }
-
-        if interview_id:
-            payload["interview_id"] = interview_id
-
-        try:
-            response = requests.post(url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
-
-            if isinstance(data, list):
-                return data
-            else:
-                return data.get("suggestions", [])
-        except requests.exceptions.RequestException as e:
-            print(f"✗ Related symptoms failed: {e}")
-            return []
+        return self._suggest(
+            "symptoms", "Related symptoms", age, sex, evidence, interview_id
+        )
 
     def suggest_red_flags(
         self,
@@ -265,30 +433,7 @@ class InfermedicaClient:
         interview_id: Optional[str] = None,
     ) -> List[Dict]:
         """Check for red flag symptoms"""
-        url = f"{self.base_url}/suggest"
-
-        payload = {
-            "sex": sex,
-            "age": {"value": age},
-            "evidence": evidence,
-            "suggest_method": "red_flags",
-        }
-
-        if interview_id:
-            payload["interview_id"] = interview_id
-
-        try:
-            response = requests.post(url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
-
-            if isinstance(data, list):
-                return data
-            else:
-                return data.get("suggestions", [])
-        except requests.exceptions.RequestException as e:
-            print(f"✗ Red flags failed: {e}")
-            return []
+        return self._suggest("red_flags", "Red flags", age, sex, evidence, interview_id)
 
     def diagnosis(
         self,
@@ -303,43 +448,49 @@ class InfermedicaClient:
 
         payload = {"sex": sex, "age": {"value": age}, "evidence": evidence}
 
-        if interview_id:
-            payload["interview_id"] = interview_id
-
         if extras:
             payload["extras"] = extras
 
-        try:
-            response = requests.post(url, headers=self.headers, json=payload)
-            response.raise_for_status()
-            data = response.json()
+        # interview_id only tags the request, so it's left out of the key
+        key = json.dumps(payload, sort_keys=True)
+        if interview_id:
+            payload["interview_id"] = interview_id
 
-            should_stop = data.get("should_stop", False)
-            conditions = data.get("conditions", [])
-            extras_response = data.get("extras", {})
-
-            question = None
-            if not should_stop and "question" in data:
-                q = data["question"]
-                question = DiagnosisQuestion(
-                    question_type=q.get("type"),
-                    question_text=q.get("text"),
-                    items=q.get("items", []),
-                    question_id=q.get("id"),
+        data = self._cache_get(self._diagnosis_cache, key)
+        if data is None:
+            try:
+                response = self.session.post(url, json=payload, timeout=REQUEST_TIMEOUT)
+                response.raise_for_status()
+                data = response.json()
+            except requests.exceptions.RequestException:
+                logger.exception("Diagnosis failed")
+                return DiagnosisResult(
+                    question=None, should_stop=True, conditions=[], extras={}
                 )
 
-            return DiagnosisResult(
-                question=question,
-                should_stop=should_stop,
-                conditions=conditions,
-                extras=extras_response,
-            )
-        except requests.exceptions.RequestException as e:
-            print(f"✗ Diagnosis failed: {e}")
-            return DiagnosisResult(
-                question=None, should_stop=True, conditions=[], extras={}
+            self._cache_put(self._diagnosis_cache, key, data)
+
+        should_stop = data.get("should_stop", False)
+        conditions = list(data.get("conditions", []))
+        extras_response = dict(data.get("extras", {}))
+
+        question = None
+        if not should_stop and "question" in data:
+            q = data["question"]
+            question = DiagnosisQuestion(
+                question_type=q.get("type"),
+                question_text=q.get("text"),
+                items=list(q.get("items", [])),
+                question_id=q.get("id"),
             )
 
+        return DiagnosisResult(
+            question=question,
+            should_stop=should_stop,
+            conditions=conditions,
+            extras=extras_response,
+        )
+
 
 def test_infermedica():
     """Test the client"""
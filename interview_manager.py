@@ -3,6 +3,8 @@ Interview Manager
 Manages the multi-turn diagnostic interview process with Infermedica
 """
 
+import logging
+import time
 import uuid
 from typing import List, Dict, Optional
 from dataclasses import dataclass, field
@@ -14,8 +16,11 @@ from infermedica_client import (
     DiagnosisQuestion,
     DiagnosisResult,
     TriageResult,
+    symptoms_to_evidence,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class InterviewStage(Enum):
     """Stages of the diagnostic interview"""
@@ -29,7 +34,7 @@ class InterviewStage(Enum):
     COMPLETE = "complete"
 
 
-@dataclass
+@dataclass(slots=True)
 class InterviewHistory:
     """Record of a question and answer in the interview"""
 
@@ -39,10 +44,10 @@ class InterviewHistory:
     item_id: str
     item_name: str
     response: str  # "present", "absent", "unknown"
-    timestamp: str = ""
+    timestamp_ns: int = 0  # time.time_ns() when answered
 
 
-@dataclass
+@dataclass(slots=True)
 class InterviewState:
     """Complete state of an interview session"""
 
@@ -106,11 +111,10 @@ class InterviewManager:
         self.state.stage = InterviewStage.INITIAL_SYMPTOMS
 
         # Add initial symptoms to evidence
-        for symptom in initial_symptoms:
-            self.state.evidence.append(
-                {"id": symptom.id, "choice_id": symptom.choice_id, "source": "initial"}
-            )
+        self.state.evidence.extend(symptoms_to_evidence(initial_symptoms))
 
+        timestamp_ns = time.time_ns()
+        for symptom in initial_symptoms:
             # Add to history
             self.state.history.append(
                 InterviewHistory(
@@ -120,14 +124,19 @@ class InterviewManager:
                     item_id=symptom.id,
                     item_name=symptom.name,
                     response=symptom.choice_id,
-                    timestamp=datetime.now().isoformat(),
+                    timestamp_ns=timestamp_ns,
                 )
             )
 
-    def collect_risk_factors(self) -> List[Dict]:
+    def collect_risk_factors(
+        self, risk_factors: Optional[List[Dict]] = None
+    ) -> List[Dict]:
         """
         Get demographic risk factors to ask about
 
+        Args:
+            risk_factors: Already-fetched /suggest result (skips the API call)
+
         Returns:
             List of risk factors (empty if already collected)
         """
@@ -135,11 +144,12 @@ class InterviewManager:
             return []
 
         # Call Infermedica API
-        risk_factors = self.client.suggest_risk_factors(
-            age=self.state.patient_age,
-            sex=self.state.patient_sex,
-            interview_id=self.state.interview_id,
-        )
+        if risk_factors is None:
+            risk_factors = self.client.suggest_risk_factors(
+                age=self.state.patient_age,
+                sex=self.state.patient_sex,
+                interview_id=self.state.interview_id,
+            )
 
         # Store for later processing
         self.pending_risk_factors = risk_factors
@@ -155,35 +165,32 @@ class InterviewManager:
             risk_factor_id: Risk factor ID (e.g., "p_8")
             response: "present", "absent", or "unknown"
         """
-        # Add to evidence
-        self.state.evidence.append(
-            {"id": risk_factor_id, "choice_id": response, "source": "suggest"}
-        )
+        self.add_risk_factor_responses({risk_factor_id: response})
 
-        # Find the risk factor name
-        rf_name = "Risk factor"
-        for rf in self.pending_risk_factors:
-            if rf.get("id") == risk_factor_id:
-                rf_name = rf.get("name", "Risk factor")
-                break
+    def add_risk_factor_responses(self, responses: Dict[str, str]):
+        """
+        Add all answers from a submitted risk factor form at once
 
-        # Add to history
-        self.state.history.append(
-            InterviewHistory(
-                stage=InterviewStage.RISK_FACTORS,
-                question_text=f"Do you have {rf_name}?",
-                question_type="risk_factor",
-                item_id=risk_factor_id,
-                item_name=rf_name,
-                response=response,
-                timestamp=datetime.now().isoformat(),
-            )
+        Args:
+            responses: Risk factor ID -> "present", "absent", or "unknown"
+        """
+        self._add_suggest_responses(
+            responses,
+            self.pending_risk_factors,
+            InterviewStage.RISK_FACTORS,
+            question_type="risk_factor",
+            default_name="Risk factor",
         )
 
-    def collect_related_symptoms(self) -> List[Dict]:
+    def collect_related_symptoms(
+        self, related: Optional[List[Dict]] = None
+    ) -> List[Dict]:
         """
         Get related symptoms to ask about
 
+        Args:
+            related: Already-fetched /suggest result (skips the API call)
+
         Returns:
             List of related symptoms (empty if already collected)
         """
@@ -191,12 +198,13 @@ class InterviewManager:
             return []
 
         # Call Infermedica API
-        related = self.client.suggest_related_symptoms(
-            evidence=self.state.evidence,
-            age=self.state.patient_age,
-            sex=self.state.patient_sex,
-            interview_id=self.state.interview_id,
-        )
+        if related is None:
+            related = self.client.suggest_related_symptoms(
+                evidence=self.state.evidence,
+                age=self.state.patient_age,
+                sex=self.state.patient_sex,
+                interview_id=self.state.interview_id,
+            )
 
         # Store for later processing
         self.pending_related_symptoms = related
@@ -212,35 +220,30 @@ class InterviewManager:
             symptom_id: Symptom ID
             response: "present", "absent", or "unknown"
         """
-        # Add to evidence
-        self.state.evidence.append(
-            {"id": symptom_id, "choice_id": response, "source": "suggest"}
-        )
+        self.add_related_symptom_responses({symptom_id: response})
 
-        # Find the symptom name
-        sym_name = "Symptom"
-        for sym in self.pending_related_symptoms:
-            if sym.get("id") == symptom_id:
-                sym_name = sym.get("name", "Symptom")
-                break
+    def add_related_symptom_responses(self, responses: Dict[str, str]):
+        """
+        Add all answers from a submitted related symptom form at once
 
-        # Add to history
-        self.state.history.append(
-            InterviewHistory(
-                stage=InterviewStage.RELATED_SYMPTOMS,
-                question_text=f"Do you have {sym_name}?",
-                question_type="related_symptom",
-                item_id=symptom_id,
-                item_name=sym_name,
-                response=response,
-                timestamp=datetime.now().isoformat(),
-            )
+        Args:
+            responses: Related symptom ID -> "present", "absent", or "unknown"
+        """
+        self._add_suggest_responses(
+            responses,
+            self.pending_related_symptoms,
+            InterviewStage.RELATED_SYMPTOMS,
+            question_type="related_symptom",
+            default_name="Symptom",
         )
 
-    def check_red_flags(self) -> List[Dict]:
+    def check_red_flags(self, red_flags: Optional[List[Dict]] = None) -> List[Dict]:
         """
         Check for safety-critical red flag symptoms
 
+        Args:
+            red_flags: Already-fetched /suggest result (skips the API call)
+
         Returns:
             List of red flags to check (empty if already checked)
         """
@@ -248,12 +251,13 @@ class InterviewManager:
             return []
 
         # Call Infermedica API
-        red_flags = self.client.suggest_red_flags(
-            evidence=self.state.evidence,
-            age=self.state.patient_age,
-            sex=self.state.patient_sex,
-            interview_id=self.state.interview_id,
-        )
+        if red_flags is None:
+            red_flags = self.client.suggest_red_flags(
+                evidence=self.state.evidence,
+                age=self.state.patient_age,
+                sex=self.state.patient_sex,
+                interview_id=self.state.interview_id,
+            )
 
         # Store for later processing
         self.pending_red_flags = red_flags
@@ -269,31 +273,54 @@ class InterviewManager:
             red_flag_id: Red flag symptom ID
             response: "present", "absent", or "unknown"
         """
-        # Add to evidence
-        self.state.evidence.append(
-            {"id": red_flag_id, "choice_id": response, "source": "suggest"}
+        self.add_red_flag_responses({red_flag_id: response})
+
+    def add_red_flag_responses(self, responses: Dict[str, str]):
+        """
+        Add all answers from a submitted red flag form at once
+
+        Args:
+            responses: Red flag ID -> "present", "absent", or "unknown"
+        """
+        self._add_suggest_responses(
+            responses,
+            self.pending_red_flags,
+            InterviewStage.RED_FLAGS,
+            question_type="red_flag",
+            default_name="Red flag symptom",
         )
 
-        # Find the red flag name
-        rf_name = "Red flag symptom"
-        for rf in self.pending_red_flags:
-            if rf.get("id") == red_flag_id:
-                rf_name = rf.get("name", "Red flag symptom")
-                break
+    def _add_suggest_responses(
+        self,
+        responses: Dict[str, str],
+        pending: List[Dict],
+        stage: InterviewStage,
+        question_type: str,
+        default_name: str,
+    ):
+        """Record /suggest answers as evidence and history in one pass"""
+        names = {item.get("id"): item.get("name", default_name) for item in pending}
+        timestamp_ns = time.time_ns()
 
-        # Add to history
-        self.state.history.append(
-            InterviewHistory(
-                stage=InterviewStage.RED_FLAGS,
-                question_text=f"Do you have {rf_name}?",
-                question_type="red_flag",
-                item_id=red_flag_id,
-                item_name=rf_name,
-                response=response,
-                timestamp=datetime.now().isoformat(),
-            )
+        self.state.evidence.extend(
+            {"id": item_id, "choice_id": response, "source": "suggest"}
+            for item_id, response in responses.items()
         )
 
+        for item_id, response in responses.items():
+            name = names.get(item_id, default_name)
+            self.state.history.append(
+                InterviewHistory(
+                    stage=stage,
+                    question_text=f"Do you have {name}?",
+                    question_type=question_type,
+                    item_id=item_id,
+                    item_name=name,
+                    response=response,
+                    timestamp_ns=timestamp_ns,
+                )
+            )
+
     def get_next_question(self) -> Optional[DiagnosisQuestion]:
         """
         Get next question from /diagnosis interview loop
@@ -365,7 +392,7 @@ class InterviewManager:
                 item_id=item_id,
                 item_name=item_name,
                 response=response,
-                timestamp=datetime.now().isoformat(),
+                timestamp_ns=time.time_ns(),
             )
         )
 
@@ -412,7 +439,9 @@ class InterviewManager:
                     "question": h.question_text,
                     "item": h.item_name,
                     "response": h.response,
-                    "timestamp": h.timestamp,
+                    "timestamp": datetime.fromtimestamp(
+                        h.timestamp_ns / 1e9
+                    ).isoformat(),
                 }
                 for h in self.state.history
             ],
@@ -434,8 +463,6 @@ class InterviewManager:
 
         try:
             # Convert evidence to ParsedSymptom format for triage
-            from infermedica_client import ParsedSymptom, TriageResult
-
             symptoms = []
             for ev in self.state.evidence:
                 if ev.get("choice_id") == "present":
@@ -466,11 +493,8 @@ class InterviewManager:
             # Return dict with both results
             return {"triage": triage, "specialist": specialist}
 
-        except Exception as e:
-            print(f"✗ Failed to get triage results: {e}")
-            import traceback
-
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Failed to get triage results")
             return None
 
     def get_state_summary(self) -> str:
@@ -137,7 +137,8 @@ def test_full_diagnosis_flow():
 
     triage = client.run_triage(parsed_symptoms, age, sex)
     print(f"✓ Triage Level: {triage.triage_level.value}")
-    print(f"✓ Recommended Specialist: {triage.recommended_specialist_name}")
+    specialist = client.recommend_specialist(parsed_symptoms, age, sex)
+    print(f"✓ Recommended Specialist: {specialist.specialist_name}")
     print(f"✓ Channel: {triage.recommended_channel}")
     print(f"✓ Root Cause: {triage.root_cause}")
 
@@ -3,8 +3,21 @@ Test Interview Manager
 Tests the complete interview flow with state management
 """
 
+from datetime import datetime, timedelta
+from functools import lru_cache
 from interview_manager import InterviewManager, InterviewStage
-from infermedica_client import InfermedicaClient
+from infermedica_client import (
+    DiagnosisQuestion,
+    DiagnosisResult,
+    InfermedicaClient,
+    ParsedSymptom,
+)
+
+
+@lru_cache(maxsize=1)
+def get_client() -> InfermedicaClient:
+    """One client (and pooled session) shared by every test in this file"""
+    return InfermedicaClient()
 
 
 def test_interview_manager_flow():
@@ -15,7 +28,7 @@ def test_interview_manager_flow():
     print("=" * 70)
 
     # Initialize
-    client = InfermedicaClient()
+    client = get_client()
     manager = InterviewManager(client, age=35, sex="male")
 
     print(f"\n✓ Initialized Interview Manager")
@@ -51,8 +64,10 @@ def test_interview_manager_flow():
         print(f"  {i}. {rf.get('name')}")
 
     # Simulate answering (say "no" to all for demo)
-    for rf in risk_factors[:3]:  # Answer first 3
-        manager.add_risk_factor_response(rf.get("id"), "absent")
+    # Answer first 3 in one submission, as the app's form does
+    manager.add_risk_factor_responses(
+        {rf.get("id"): "absent" for rf in risk_factors[:3]}
+    )
 
     print(f"\n✓ Answered {min(3, len(risk_factors))} risk factor questions")
     print(f"  Evidence: {len(manager.state.evidence)} items")
@@ -67,9 +82,10 @@ def test_interview_manager_flow():
     for i, sym in enumerate(related[:5], 1):
         print(f"  {i}. {sym.get('name')}")
 
-    # Simulate answering
-    for sym in related[:3]:  # Answer first 3
-        manager.add_related_symptom_response(sym.get("id"), "absent")
+    # Simulate answering the first 3
+    manager.add_related_symptom_responses(
+        {sym.get("id"): "absent" for sym in related[:3]}
+    )
 
     print(f"\n✓ Answered {min(3, len(related))} related symptom questions")
     print(f"  Evidence: {len(manager.state.evidence)} items")
@@ -84,9 +100,8 @@ def test_interview_manager_flow():
     for i, rf in enumerate(red_flags, 1):
         print(f"  {i}. ⚠️  {rf.get('name')}")
 
-    # Simulate answering
-    for rf in red_flags:  # Answer all red flags
-        manager.add_red_flag_response(rf.get("id"), "absent")
+    # Simulate answering all red flags
+    manager.add_red_flag_responses({rf.get("id"): "absent" for rf in red_flags})
 
     print(f"\n✓ Answered {len(red_flags)} red flag questions")
     print(f"  Evidence: {len(manager.state.evidence)} items")
@@ -97,16 +112,14 @@ def test_interview_manager_flow():
     print("=" * 70)
 
     max_questions = 5  # Limit for demo
-    question_count = 0
 
-    while not manager.is_interview_complete() and question_count < max_questions:
+    for question_count in range(1, max_questions + 1):
         question = manager.get_next_question()
 
         if not question:
             print(f"\n✓ Interview complete!")
             break
 
-        question_count += 1
         print(f"\n❓ Question {question_count}:")
         print(f"   Type: {question.question_type}")
         print(f"   Text: {question.question_text}")
@@ -119,8 +132,7 @@ def test_interview_manager_flow():
             # Simulate answering "no"
             manager.answer_question(item.get("id"), "absent")
             print(f"   → Response: absent")
-
-    if question_count >= max_questions:
+    else:
         print(f"\n⚠️  Stopped after {max_questions} questions (demo limit)")
 
     # Show progress
@@ -167,7 +179,7 @@ def test_manager_state():
     print("Testing State Management")
     print("=" * 70)
 
-    client = InfermedicaClient()
+    client = get_client()
     manager = InterviewManager(client, age=30, sex="female")
 
     # Test initial state
@@ -193,6 +205,107 @@ def test_manager_state():
     print("\n✅ State management working!")
 
 
+class StubClient:
+    """Offline stand-in for InfermedicaClient: one question, then stop"""
+
+    def __init__(self):
+        self.results = [
+            DiagnosisResult(
+                question=DiagnosisQuestion(
+                    question_type="single",
+                    question_text="Do you have a fever?",
+                    items=[{"id": "s_98", "name": "Fever"}],
+                ),
+                should_stop=False,
+                conditions=[],
+                extras={},
+            ),
+            DiagnosisResult(
+                question=None,
+                should_stop=True,
+                conditions=[{"id": "c_1", "common_name": "Angina", "probability": 0.4}],
+                extras={},
+            ),
+        ]
+
+    def diagnosis(self, **kwargs) -> DiagnosisResult:
+        return self.results.pop(0)
+
+
+def run_stub_interview() -> InterviewManager:
+    """Walk a stubbed interview through every stage, answering in bulk"""
+    manager = InterviewManager(StubClient(), age=35, sex="male")
+    manager.start_interview([ParsedSymptom("s_1", "Chest pain", "Chest pain")])
+
+    manager.collect_risk_factors([{"id": "p_1", "name": "Smoking"}, {"id": "p_2"}])
+    manager.add_risk_factor_responses(
+        {"p_1": "present", "p_2": "absent", "p_3": "unknown"}
+    )
+
+    manager.collect_related_symptoms([{"id": "s_2", "name": "Cough"}])
+    manager.add_related_symptom_responses({"s_2": "absent", "s_3": "present"})
+
+    manager.check_red_flags([])
+    manager.add_red_flag_responses({"s_4": "absent"})
+
+    question = manager.get_next_question()
+    manager.answer_question(question.items[0]["id"], "present")
+    assert manager.get_next_question() is None
+    assert manager.is_interview_complete()
+
+    return manager
+
+
+def test_bulk_responses_evidence_offline():
+    """Bulk answers land in evidence in answer order with the right source"""
+    manager = run_stub_interview()
+
+    assert [(e["id"], e["choice_id"], e["source"]) for e in manager.state.evidence] == [
+        ("s_1", "present", "initial"),
+        ("p_1", "present", "suggest"),
+        ("p_2", "absent", "suggest"),
+        ("p_3", "unknown", "suggest"),
+        ("s_2", "absent", "suggest"),
+        ("s_3", "present", "suggest"),
+        ("s_4", "absent", "suggest"),
+        ("s_98", "present", "predefined"),
+    ]
+
+
+def test_bulk_responses_history_offline():
+    """History names come from the pending items, else the stage's default"""
+    manager = run_stub_interview()
+    history = manager.get_final_results()["history"]
+
+    assert [(h["stage"], h["item"], h["response"]) for h in history] == [
+        (InterviewStage.INITIAL_SYMPTOMS.value, "Chest pain", "present"),
+        (InterviewStage.RISK_FACTORS.value, "Smoking", "present"),
+        (InterviewStage.RISK_FACTORS.value, "Risk factor", "absent"),
+        (InterviewStage.RISK_FACTORS.value, "Risk factor", "unknown"),
+        (InterviewStage.RELATED_SYMPTOMS.value, "Cough", "absent"),
+        (InterviewStage.RELATED_SYMPTOMS.value, "Symptom", "present"),
+        (InterviewStage.RED_FLAGS.value, "Red flag symptom", "absent"),
+        (InterviewStage.INTERVIEW_LOOP.value, "Fever", "present"),
+    ]
+    assert history[1]["question"] == "Do you have Smoking?"
+    assert history[2]["question"] == "Do you have Risk factor?"
+
+
+def test_history_timestamps_offline():
+    """History timestamps come back as local ISO 8601 strings"""
+    before = datetime.now()
+    manager = run_stub_interview()
+    after = datetime.now()
+
+    for entry in manager.get_final_results()["history"]:
+        timestamp = datetime.fromisoformat(entry["timestamp"])
+        assert timestamp.isoformat() == entry["timestamp"]
+        # Allow for float rounding in the ns -> datetime conversion
+        assert (
+            before - timedelta(seconds=1) <= timestamp <= after + timedelta(seconds=1)
+        )
+
+
 if __name__ == "__main__":
     print("\n🧪 Running Interview Manager Tests\n")
 
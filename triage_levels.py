@@ -0,0 +1,16 @@
+"""
+Triage Levels
+Infermedica's triage scale, shared by the API client and the matcher
+"""
+
+from enum import Enum
+
+
+class TriageLevel(Enum):
+    """5-level triage from Infermedica"""
+
+    EMERGENCY_AMBULANCE = "emergency_ambulance"
+    EMERGENCY = "emergency"
+    CONSULTATION_24 = "consultation_24"
+    CONSULTATION = "consultation"
+    SELF_CARE = "self_care"